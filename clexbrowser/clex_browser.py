@@ -12,7 +12,7 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QProgressBar, QMenu, QShortcut, QComboBox, QGraphicsDropShadowEffect)
 
 from PyQt5.QtCore import Qt, QSize, QSettings, QThread, pyqtSignal, QTimer, QUrl
-from PyQt5.QtGui import (QFont, QColor, QIcon, QKeySequence)
+from PyQt5.QtGui import (QFont, QColor, QIcon, QKeySequence, QTextCursor)
 
 # Import database manager
 from database_manager import DatabaseManager
@@ -33,6 +33,9 @@ from workers import DatabaseWorker, LoadTechnologiesWorker, LoadDevicesWorker, L
 # Import command manager
 from command_manager import CommandManager, EditClexDefinitionCommand, AddClexDefinitionCommand, DeleteClexDefinitionCommand
 
+# Item data role holding whether a device list entry has a CLEX definition
+HAS_CLEX_ROLE = Qt.UserRole + 1
+
 class FavoritesManager:
     """
     Manages favorite CLEX definitions.
@@ -170,6 +173,7 @@ class EnhancedCLEXBrowser(QMainWindow):
         self.current_device_id = None
         self.current_device_name = None
         self.dark_mode = False
+        self.confirmation_service = None
         
         # Initialize settings
         self.settings = QSettings("CLEXBrowser", "EnhancedCLEXBrowser")
@@ -938,15 +942,22 @@ class EnhancedCLEXBrowser(QMainWindow):
 
     def update_technology_listbox(self):
         """Update the technology list display."""
-        self.tech_list.clear()
-        for tech_id, tech_name, tech_version in self.technologies:
-            display_text = f"{tech_name} v{tech_version}" if tech_version else tech_name
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.UserRole, tech_id)
-            self.tech_list.addItem(item)
+        # Suspend repaints and signals so the list is laid out once
+        self.tech_list.setUpdatesEnabled(False)
+        self.tech_list.blockSignals(True)
+        try:
+            self.tech_list.clear()
+            for tech_id, tech_name, tech_version in self.technologies:
+                display_text = f"{tech_name} v{tech_version}" if tech_version else tech_name
+                item = QListWidgetItem(display_text)
+                item.setData(Qt.UserRole, tech_id)
+                self.tech_list.addItem(item)
+        finally:
+            self.tech_list.blockSignals(False)
+            self.tech_list.setUpdatesEnabled(True)
     
     def on_tech_select(self, current, previous):
-        """Handle technology selection with direct database access."""
+        """Handle technology selection by reading through the database manager."""
         if not current:
             return
         
@@ -960,32 +971,11 @@ class EnhancedCLEXBrowser(QMainWindow):
         self.status_indicator.start_indeterminate()
         
         try:
-            # Direct database access
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Get devices
-            cursor.execute(
-                "SELECT id, name, has_clex_definition FROM devices WHERE technology_id = ? ORDER BY name", 
-                (tech_id,)
-            )
-            devices = cursor.fetchall()
-            
-            # Get statistics
-            cursor.execute(
-                "SELECT COUNT(*) FROM devices WHERE technology_id = ? AND has_clex_definition = 1", 
-                (tech_id,)
-            )
-            clex_count = cursor.fetchone()[0]
-            
-            cursor.execute(
-                "SELECT COUNT(*) FROM clex_definitions c JOIN devices d ON c.device_id = d.id "
-                "WHERE d.technology_id = ?", 
-                (tech_id,)
-            )
-            total_clex = cursor.fetchone()[0]
-            
-            conn.close()
+            # Read through the manager's persistent connection
+            devices = self.db_manager.get_devices(tech_id)
+            stats = self.db_manager.get_tech_statistics(tech_id)
+            clex_count = stats["clex_devices"]
+            total_clex = stats["total_clex"]
             
             # Update state
             self.devices = devices
@@ -1119,19 +1109,27 @@ class EnhancedCLEXBrowser(QMainWindow):
     
     def update_device_listbox(self):
         """Update the device list display."""
-        self.device_list.clear()
-        for device_id, device_name, has_clex in self.devices:
-            item = QListWidgetItem(device_name)
-            item.setData(Qt.UserRole, device_id)
-            
-            if has_clex:
-                font = QFont("Arial", 10, QFont.Bold)
-                item.setFont(font)
-                item.setForeground(QColor("black") if not self.dark_mode else QColor("white"))
-            else:
-                item.setForeground(QColor("gray"))
-            
-            self.device_list.addItem(item)
+        # Suspend repaints and signals so the list is laid out once
+        self.device_list.setUpdatesEnabled(False)
+        self.device_list.blockSignals(True)
+        try:
+            self.device_list.clear()
+            for device_id, device_name, has_clex in self.devices:
+                item = QListWidgetItem(device_name)
+                item.setData(Qt.UserRole, device_id)
+                item.setData(HAS_CLEX_ROLE, bool(has_clex))
+                
+                if has_clex:
+                    font = QFont("Arial", 10, QFont.Bold)
+                    item.setFont(font)
+                    item.setForeground(QColor("black") if not self.dark_mode else QColor("white"))
+                else:
+                    item.setForeground(QColor("gray"))
+                
+                self.device_list.addItem(item)
+        finally:
+            self.device_list.blockSignals(False)
+            self.device_list.setUpdatesEnabled(True)
     
 
     def on_device_select(self, current, previous):
@@ -1142,7 +1140,7 @@ class EnhancedCLEXBrowser(QMainWindow):
         device_id = current.data(Qt.UserRole)
         self.current_device_id = device_id
         self.current_device_name = current.text()
-        has_clex = current.font().bold()
+        has_clex = current.data(HAS_CLEX_ROLE)
         
         if has_clex:
             self.load_clex_definition(device_id, self.current_device_name)
@@ -1154,31 +1152,22 @@ class EnhancedCLEXBrowser(QMainWindow):
         self.settings.setValue("last_device_id", device_id)
 
     def load_clex_definition(self, device_id, device_name):
-        """Load CLEX definition using direct database access."""
+        """Load CLEX definition through the database manager."""
         self.loading_overlay.show_loading(f"Loading CLEX definition for {device_name}...")
         self.status_indicator.start_indeterminate()
         
         try:
-            # Direct database access
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT folder_path, file_name, definition_text FROM clex_definitions WHERE device_id = ?", 
-                (device_id,)
-            )
-            result = cursor.fetchone()
-            conn.close()
+            # Read through the manager's persistent connection
+            result = self.db_manager.get_clex_definition(device_id)
             
             if result:
                 folder_path, file_name, definition_text = result
                 
                 # Process result directly
                 header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
-                full_text = header_text + definition_text
                 
                 # Update UI directly
-                self.clex_text.clear()
-                self.clex_text.setPlainText(full_text)
+                self.set_clex_text(header_text, definition_text)
                 self.setWindowTitle(f"Enhanced CLEX Browser - {device_name}")
                 self.status_bar.showMessage(f"Loaded CLEX definition for '{device_name}'")
             else:
@@ -1218,6 +1207,27 @@ class EnhancedCLEXBrowser(QMainWindow):
         self.clex_text.clear()
         self.setWindowTitle("Enhanced CLEX Browser")
     
+    def set_clex_text(self, header_text, definition_text):
+        """
+        Display a CLEX definition below its header.
+        
+        Both parts are inserted through a text cursor so the concatenated
+        string is never built, and undo is disabled while inserting so the
+        document does not keep a second copy of the body.
+        
+        Args:
+            header_text: Device, folder and file header
+            definition_text: The CLEX definition text
+        """
+        document = self.clex_text.document()
+        document.setUndoRedoEnabled(False)
+        self.clex_text.clear()
+        cursor = self.clex_text.textCursor()
+        cursor.insertText(header_text)
+        cursor.insertText(definition_text)
+        document.setUndoRedoEnabled(True)
+        self.clex_text.moveCursor(QTextCursor.Start)
+    
     def copy_clex_to_clipboard(self):
         """Copy CLEX definition to clipboard."""
         text = self.clex_text.toPlainText()
@@ -1239,7 +1249,7 @@ class EnhancedCLEXBrowser(QMainWindow):
         
         device_id = item.data(Qt.UserRole)
         device_name = item.text()
-        has_clex = item.font().bold()
+        has_clex = item.data(HAS_CLEX_ROLE)
         
         menu = QMenu()
         
@@ -1469,12 +1479,24 @@ class EnhancedCLEXBrowser(QMainWindow):
         else:
             self.load_technologies()
     
+    def get_confirmation_service(self):
+        """
+        Get the confirmation service, creating it on first use.
+        
+        One service is kept per window so its dialog and cached
+        "don't show again" preferences are reused across confirmations.
+        
+        Returns:
+            ConfirmationService instance
+        """
+        if self.confirmation_service is None:
+            from dialogs.confirmation_dialog import ConfirmationService
+            self.confirmation_service = ConfirmationService()
+        return self.confirmation_service
+    
     def reload_database(self):
         """Reload the database from a log file."""
-        from dialogs.confirmation_dialog import ConfirmationService
-        
-        confirmation_service = ConfirmationService()
-        if not confirmation_service.confirm_action(
+        if not self.get_confirmation_service().confirm_action(
             self,
             "Refresh Database",
             "Do you want to reload the database from a log file?",
@@ -1527,6 +1549,9 @@ class EnhancedCLEXBrowser(QMainWindow):
             # Clear command history
             self.command_manager.clear_history()
             
+            # The file was replaced, so reopen the persistent connection
+            self.db_manager.close()
+            
             # Reload data
             self.load_technologies()
             self.update_button_states()
@@ -1576,9 +1601,7 @@ class EnhancedCLEXBrowser(QMainWindow):
             return
         
         # Get confirmation
-        from dialogs.confirmation_dialog import ConfirmationService
-        confirmation_service = ConfirmationService()
-        if not confirmation_service.confirm_edit(
+        if not self.get_confirmation_service().confirm_edit(
             self,
             "CLEX Definition",
             self.current_device_name,
@@ -1599,6 +1622,9 @@ class EnhancedCLEXBrowser(QMainWindow):
             self.load_clex_definition(self.current_device_id, self.current_device_name)
             self.update_button_states()
             self.update_undo_redo_actions()
+            # Shown after the reload so its "Loaded" message does not replace it
+            if dialog.status_message:
+                self.status_bar.showMessage(dialog.status_message, 5000)
     
     def delete_clex_definition(self):
         """Delete the current CLEX definition."""
@@ -1621,9 +1647,7 @@ class EnhancedCLEXBrowser(QMainWindow):
             return
         
         # Get confirmation
-        from dialogs.confirmation_dialog import ConfirmationService
-        confirmation_service = ConfirmationService()
-        if not confirmation_service.confirm_delete(
+        if not self.get_confirmation_service().confirm_delete(
             self,
             "CLEX Definition",
             self.current_device_name,
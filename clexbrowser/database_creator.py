@@ -183,6 +183,10 @@ def create_database(db_name, technologies, devices_dict, clex_definitions):
     conn = sqlite3.connect(db_name)
     cursor = conn.cursor()
     
+    # Larger pages suit the multi-KB definition_text blobs; only takes
+    # effect before the first table is created
+    cursor.execute("PRAGMA page_size=8192")
+    
     # Create tables
     cursor.execute('''
     CREATE TABLE technologies (
@@ -211,6 +215,13 @@ def create_database(db_name, technologies, devices_dict, clex_definitions):
         FOREIGN KEY (device_id) REFERENCES devices(id)
     )''')
     
+    # Clear the device flag whenever its CLEX definition is deleted
+    cursor.execute('''
+    CREATE TRIGGER trg_clex_delete AFTER DELETE ON clex_definitions
+    BEGIN
+        UPDATE devices SET has_clex_definition = 0 WHERE id = OLD.device_id;
+    END''')
+    
     # Insert technologies
     for tech_name, tech_version, tech_path in technologies:
         cursor.execute("INSERT INTO technologies (name, version, path) VALUES (?, ?, ?)",
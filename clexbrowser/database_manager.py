@@ -1,8 +1,530 @@
 import sqlite3
 import os
-from typing import List, Tuple, Dict, Any, Optional, Union
+import pickle
+import re
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Iterator, Optional, Union
 from datetime import datetime
 
+from PyQt5.QtCore import QStandardPaths
+
+# File name of the technology list cache kept between runs
+TECH_CACHE_FILE = "tech_cache.pkl"
+
+# Lowercases ASCII A-Z in a bytes object; CLEX syntax is ASCII and SQLite's
+# LOWER()/LIKE only fold ASCII as well
+LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+# Rows fetched per batch by the streaming search, bounding how many
+# definition texts are held in memory at once
+SEARCH_FETCH_SIZE = 200
+
+# "Folder Path:"/"File Name:" lines stored in a definition, which the
+# display header already shows; match() against each line, indentation
+# is skipped the same way line.strip() would
+HEADER_LINE_RE = re.compile(r'\s*(?:Folder Path|File Name):')
+
+# Clears a device's CLEX flag whenever its definition row is deleted, so
+# deletes need only one statement
+SQL_CREATE_CLEX_DELETE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS trg_clex_delete AFTER DELETE ON clex_definitions "
+    "BEGIN UPDATE devices SET has_clex_definition = 0 WHERE id = OLD.device_id; END"
+)
+
+# A device with its technology and CLEX definition in one statement; the
+# definition columns are NULL when the device has none
+SQL_DEVICE_WITH_CLEX = (
+    "SELECT d.name, t.name, t.version, c.folder_path, c.file_name, c.definition_text "
+    "FROM devices d "
+    "LEFT JOIN technologies t ON d.technology_id = t.id "
+    "LEFT JOIN clex_definitions c ON c.device_id = d.id "
+    "WHERE d.id = ?"
+)
+
+# Trigram full-text index over the definition text. A trigram table answers
+# LIKE '%term%' from its index with the same case-insensitive substring
+# semantics as LIKE on the base table; content= keeps the text stored once
+SQL_CREATE_CLEX_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS clex_definitions_fts USING fts5("
+    "definition_text, content='clex_definitions', content_rowid='id', tokenize='trigram')"
+)
+
+# Keep the full-text index in step with clex_definitions; updates that leave
+# definition_text alone do not touch it
+SQL_CREATE_CLEX_FTS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS trg_clex_fts_insert AFTER INSERT ON clex_definitions "
+    "BEGIN INSERT INTO clex_definitions_fts(rowid, definition_text) "
+    "VALUES (new.id, new.definition_text); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_clex_fts_delete AFTER DELETE ON clex_definitions "
+    "BEGIN INSERT INTO clex_definitions_fts(clex_definitions_fts, rowid, definition_text) "
+    "VALUES ('delete', old.id, old.definition_text); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_clex_fts_update AFTER UPDATE OF definition_text "
+    "ON clex_definitions "
+    "BEGIN INSERT INTO clex_definitions_fts(clex_definitions_fts, rowid, definition_text) "
+    "VALUES ('delete', old.id, old.definition_text); "
+    "INSERT INTO clex_definitions_fts(rowid, definition_text) "
+    "VALUES (new.id, new.definition_text); END",
+)
+
+# GLOB wildcard characters, each matched literally when put in a bracket class
+_GLOB_SPECIAL_RE = re.compile(r'([*?[])')
+
+# A double-quoted phrase or a whitespace-delimited term of a multi-term search
+_SEARCH_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+# Definitions are looked up and joined by device; without this index each
+# lookup scans every definition row, large texts included
+SQL_CREATE_CLEX_DEVICE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_clex_def_device ON clex_definitions(device_id)"
+)
+
+# Covering index that returns a technology's devices already in name order,
+# so the bulk item list needs no temp B-tree sort; it also covers the
+# per-technology device and CLEX counts of the statistics
+SQL_CREATE_DEVICE_TECH_NAME_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_devices_tech_name "
+    "ON devices(technology_id, name, has_clex_definition)"
+)
+
+# Partial index holding only devices with a definition, already in name
+# order, so the compare dialog's device list is a range scan with no sort
+SQL_CREATE_DEVICE_TECH_CLEX_NAME_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_devices_tech_clex_name "
+    "ON devices(technology_id, has_clex_definition, name) WHERE has_clex_definition = 1"
+)
+
+# Device name indexes for prefix searches, one per collation so both the
+# case-sensitive range and the case-insensitive LIKE can seek instead of scan
+SQL_CREATE_DEVICE_NAME_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_devices_name ON devices(name)",
+    "CREATE INDEX IF NOT EXISTS idx_devices_name_nocase ON devices(name COLLATE NOCASE)",
+)
+
+# Device name search statements by (case_sensitive, prefix_match). Built once
+# so every search passes the same text and reuses the connection's prepared
+# statement instead of recompiling it
+_DEVICE_NAME_SEARCH_SQL = {
+    key: ("SELECT d.id, d.name, t.name, t.id FROM devices d "
+          "JOIN technologies t ON d.technology_id = t.id "
+          "WHERE " + where + " ORDER BY t.name, d.name")
+    for key, where in (
+        # Substring match; LIKE folds ASCII case itself, exactly as LOWER()
+        # would, so the column is compared without lowercasing every row
+        ((False, False), "d.name LIKE ? ESCAPE '\\'"),
+        # GLOB never folds case, unlike LIKE
+        ((True, False), "d.name GLOB ?"),
+        # No leading wildcard, so SQLite seeks the NOCASE name index
+        ((False, True), "d.name LIKE ? ESCAPE '\\'"),
+        # Range on the binary name index
+        ((True, True), "d.name >= ? AND d.name < ?"),
+    )
+}
+
+# Definition search statements by (case_sensitive, use_fts), built once like
+# _DEVICE_NAME_SEARCH_SQL. With the full-text index both LIKE and GLOB are
+# answered from it; without it LIKE compares each definition as stored rather
+# than a lowercased copy. The index cannot serve a LIKE with an ESCAPE clause,
+# so it is given the unescaped pattern, which matches a superset of rows, and
+# the escaped pattern then filters those candidates exactly
+_DEFINITION_SEARCH_SQL = {
+    key: ("SELECT d.id, d.name, t.name, t.id, c.definition_text " + source +
+          "JOIN devices d ON c.device_id = d.id "
+          "JOIN technologies t ON d.technology_id = t.id "
+          "WHERE " + where + " ORDER BY t.name, d.name")
+    for key, source, where in (
+        ((False, False), "FROM clex_definitions c ", "c.definition_text LIKE ? ESCAPE '\\'"),
+        ((True, False), "FROM clex_definitions c ", "c.definition_text GLOB ?"),
+        ((False, True), "FROM clex_definitions_fts f JOIN clex_definitions c ON c.id = f.rowid ",
+         "f.definition_text LIKE ? AND c.definition_text LIKE ? ESCAPE '\\'"),
+        ((True, True), "FROM clex_definitions_fts f JOIN clex_definitions c ON c.id = f.rowid ",
+         "f.definition_text GLOB ?"),
+    )
+}
+
+def build_device_name_search(search_text: str, case_sensitive: bool,
+                             prefix_match: bool) -> Tuple[str, tuple]:
+    """
+    Build the device name search query.
+    
+    A prefix match is written so SQLite can answer it from a name index:
+    a range on the binary index when case matters, otherwise a LIKE without
+    a leading wildcard on the NOCASE index.
+    
+    Args:
+        search_text: Text to search for
+        case_sensitive: Whether to use case-sensitive search
+        prefix_match: Whether names must start with the text rather than contain it
+        
+    Returns:
+        Tuple of (sql, parameters) selecting device id, device name,
+        technology name and technology id
+    """
+    sql = _DEVICE_NAME_SEARCH_SQL[case_sensitive, prefix_match]
+    if not prefix_match:
+        if case_sensitive:
+            return sql, (f"*{_glob_escape(search_text)}*",)
+        return sql, (f"%{_escape_like(search_text)}%",)
+    if case_sensitive:
+        # Every name starting with the text sorts between it and the text
+        # with its last character incremented
+        return sql, (search_text, search_text[:-1] + chr(ord(search_text[-1]) + 1))
+    return sql, (f"{_escape_like(search_text)}%",)
+
+def build_definition_search(search_text: str, case_sensitive: bool,
+                            use_fts: bool) -> Tuple[str, tuple]:
+    """
+    Build the CLEX definition search query.
+    
+    Case-sensitive searches use GLOB, which never folds case. Without the
+    full-text index every definition is scanned.
+    
+    Args:
+        search_text: Text to search for
+        case_sensitive: Whether to use case-sensitive search
+        use_fts: Whether the full-text index over definitions is available
+        
+    Returns:
+        Tuple of (sql, parameters) selecting device id, device name,
+        technology name, technology id and definition text
+    """
+    include, exclude = parse_search_terms(search_text)
+    if len(include) > 1 or exclude:
+        return _build_multi_term_definition_search(include, exclude, case_sensitive, use_fts)
+    search_text = include[0]
+    
+    sql = _DEFINITION_SEARCH_SQL[case_sensitive, use_fts]
+    if case_sensitive:
+        return sql, (f"*{_glob_escape(search_text)}*",)
+    if use_fts:
+        return sql, (f"%{search_text}%", f"%{_escape_like(search_text)}%")
+    return sql, (f"%{_escape_like(search_text)}%",)
+
+def _build_multi_term_definition_search(include: List[str], exclude: List[str],
+                                        case_sensitive: bool,
+                                        use_fts: bool) -> Tuple[str, tuple]:
+    """
+    Build a definition search requiring every included term and no excluded one.
+    
+    With the full-text index the included terms are intersected by an FTS5
+    MATCH, so only definitions containing all of them are read. The trigram
+    tokenizer cannot look up terms shorter than three characters and folds
+    case, so MATCH only narrows the candidates; each term is still checked
+    on the definition text with the same LIKE or GLOB as a single-term search.
+    
+    Args:
+        include: Terms the definition must contain
+        exclude: Terms the definition must not contain
+        case_sensitive: Whether to use case-sensitive search
+        use_fts: Whether the full-text index over definitions is available
+        
+    Returns:
+        Tuple of (sql, parameters) selecting device id, device name,
+        technology name, technology id and definition text
+    """
+    if case_sensitive:
+        predicate = "c.definition_text {}GLOB ?"
+        patterns = [f"*{_glob_escape(term)}*" for term in include + exclude]
+    else:
+        predicate = "c.definition_text {}LIKE ? ESCAPE '\\'"
+        patterns = [f"%{_escape_like(term)}%" for term in include + exclude]
+    conditions = ([predicate.format("") for _ in include] +
+                  [predicate.format("NOT ") for _ in exclude])
+    params = tuple(patterns)
+    
+    indexed = [term for term in include if len(term) >= 3]
+    if use_fts and indexed:
+        source = "FROM clex_definitions_fts f JOIN clex_definitions c ON c.id = f.rowid "
+        # Each term is a quoted FTS5 string, so its characters carry no syntax
+        conditions.insert(0, "f.definition_text MATCH ?")
+        params = (" AND ".join('"' + term.replace('"', '""') + '"' for term in indexed),) + params
+    else:
+        source = "FROM clex_definitions c "
+    
+    sql = ("SELECT d.id, d.name, t.name, t.id, c.definition_text " + source +
+           "JOIN devices d ON c.device_id = d.id "
+           "JOIN technologies t ON d.technology_id = t.id "
+           "WHERE " + " AND ".join(conditions) + " ORDER BY t.name, d.name")
+    return sql, params
+
+def parse_search_terms(search_text: str) -> Tuple[List[str], List[str]]:
+    """
+    Split a definition search into the terms to include and to exclude.
+    
+    Text without whitespace is a single term. Otherwise each
+    whitespace-separated word is a term, "a quoted phrase" is one term and
+    a word starting with - is excluded. Text with no term left to include
+    is searched for as a whole.
+    
+    Args:
+        search_text: Text to search for
+        
+    Returns:
+        Tuple of (included terms, excluded terms); the first included term
+        is the one located for the match context
+    """
+    if not any(char.isspace() for char in search_text):
+        return [search_text], []
+    
+    include, exclude = [], []
+    for phrase, word in _SEARCH_TERM_RE.findall(search_text):
+        if phrase:
+            include.append(phrase)
+        elif word.startswith('-') and len(word) > 1:
+            exclude.append(word[1:])
+        else:
+            include.append(word)
+    if not include:
+        return [search_text], []
+    return include, exclude
+
+def _escape_like(text: str) -> str:
+    """
+    Escape LIKE wildcards so the text matches itself.
+    
+    Args:
+        text: Text to escape
+        
+    Returns:
+        The text with \\, % and _ escaped for LIKE ... ESCAPE '\\'
+    """
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _glob_escape(text: str) -> str:
+    """
+    Escape GLOB wildcards so the text matches itself.
+    
+    Args:
+        text: Text to escape
+        
+    Returns:
+        The text with *, ? and [ wrapped in bracket classes
+    """
+    return _GLOB_SPECIAL_RE.sub(r'[\1]', text)
+
+def iter_search_results(conn: sqlite3.Connection, search_text: str,
+                        case_sensitive: bool = False, search_devices: bool = True,
+                        search_defs: bool = True, prefix_match: bool = False,
+                        has_fts: bool = False,
+                        cancel_event: Optional[threading.Event] = None
+                        ) -> Iterator[List[Tuple]]:
+    """
+    Search device names and CLEX definitions on a connection, streaming the results.
+    
+    Rows are fetched SEARCH_FETCH_SIZE at a time, so only one batch of
+    definition texts is in memory, and the cancel event is checked between
+    batches. The caller owns the connection and must keep other threads off
+    it until the generator is exhausted.
+    
+    Args:
+        conn: Connection to search on
+        search_text: Text to search for
+        case_sensitive: Whether to use case-sensitive search
+        search_devices: Whether to search device names
+        search_defs: Whether to search CLEX definitions
+        prefix_match: Whether device names must start with the text
+        has_fts: Whether the clex_definitions_fts index is available
+        cancel_event: Optional event that stops the search early when set
+        
+    Yields:
+        Non-empty lists of search results
+        
+    Raises:
+        sqlite3.Error: If a database error occurs
+    """
+    cursor = conn.cursor()
+    cursor.arraysize = SEARCH_FETCH_SIZE
+    
+    if search_devices:
+        cursor.execute(*build_device_name_search(search_text, case_sensitive, prefix_match))
+        rows = cursor.fetchmany()
+        while rows:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield [(device_id, device_name, tech_name, tech_id, "Device Name", device_name)
+                   for device_id, device_name, tech_name, tech_id in rows]
+            rows = cursor.fetchmany()
+    
+    if search_defs:
+        cursor.execute(*build_definition_search(search_text, case_sensitive, has_fts))
+        # The context is the line holding the first included term
+        search_text = parse_search_terms(search_text)[0][0]
+        needle = search_text.encode('utf-8').translate(LOWER_TABLE)
+        rows = cursor.fetchmany()
+        while rows:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            results = []
+            for device_id, device_name, tech_name, tech_id, definition_text in rows:
+                if case_sensitive:
+                    match_pos = definition_text.find(search_text)
+                    if match_pos < 0:
+                        continue
+                    start_line = definition_text.rfind('\n', 0, match_pos) + 1
+                    end_line = definition_text.find('\n', match_pos)
+                    if end_line < 0:
+                        end_line = len(definition_text)
+                    context = definition_text[start_line:end_line]
+                else:
+                    # Fold case with a byte translate table instead of
+                    # allocating a lowercased copy of the whole str
+                    raw = definition_text.encode('utf-8', errors='replace')
+                    match_pos = raw.translate(LOWER_TABLE).find(needle)
+                    if match_pos < 0:
+                        continue
+                    start_line = raw.rfind(b'\n', 0, match_pos) + 1
+                    end_line = raw.find(b'\n', match_pos)
+                    if end_line < 0:
+                        end_line = len(raw)
+                    context = raw[start_line:end_line].decode('utf-8', errors='replace')
+                results.append((device_id, device_name, tech_name, tech_id, "CLEX Definition", context))
+            if results:
+                yield results
+            rows = cursor.fetchmany()
+
+def ensure_search_indexes(conn: sqlite3.Connection) -> bool:
+    """
+    Create the indexes used by the global search if they do not exist.
+    
+    Args:
+        conn: Connection to the SQLite database, in autocommit mode
+        
+    Returns:
+        True if the full-text index over definitions is available
+    """
+    for statement in SQL_CREATE_DEVICE_NAME_INDEXES:
+        conn.execute(statement)
+    return ensure_clex_fts(conn)
+
+def ensure_clex_fts(conn: sqlite3.Connection) -> bool:
+    """
+    Create the full-text index over CLEX definitions if it does not exist.
+    
+    The first call on a database builds the index from the existing rows;
+    later calls only look it up. The connection must be in autocommit mode.
+    
+    Args:
+        conn: Connection to the SQLite database
+        
+    Returns:
+        True if the index is available, False if SQLite was built without FTS5
+    """
+    exists = "SELECT 1 FROM sqlite_master WHERE name = 'clex_definitions_fts'"
+    if conn.execute(exists).fetchone():
+        return True
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another connection may have built it while we waited for the lock
+            if not conn.execute(exists).fetchone():
+                conn.execute(SQL_CREATE_CLEX_FTS)
+                for trigger in SQL_CREATE_CLEX_FTS_TRIGGERS:
+                    conn.execute(trigger)
+                conn.execute(
+                    "INSERT INTO clex_definitions_fts(clex_definitions_fts) VALUES ('rebuild')"
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    except sqlite3.OperationalError as e:
+        print(f"Warning: full-text search unavailable: {e}")
+        return False
+    return True
+
+@lru_cache(maxsize=8)
+def get_shared_connection(db_file: str) -> sqlite3.Connection:
+    """
+    Get the application-wide connection for dialogs without a DatabaseManager.
+    
+    Opened once per database file and never closed, so dialog actions skip
+    opening the file and reading its header every time. The connection is
+    in autocommit mode; single statements need no explicit commit.
+    
+    Args:
+        db_file: Path to the SQLite database file
+        
+    Returns:
+        A connection to the SQLite database
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+def open_task_connection(db_file: str) -> sqlite3.Connection:
+    """
+    Open a private connection for a QThreadPool task.
+    
+    The shared connection has no lock and is used by GUI dialogs, including
+    their write transactions, so pool threads read through a connection of
+    their own instead. WAL lets it read while the GUI writes. The caller
+    closes it on the thread that opened it.
+    
+    Args:
+        db_file: Path to the SQLite database file
+        
+    Returns:
+        A connection to the SQLite database
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+def build_clex_update(device_id: int, folder_path: Optional[str] = None,
+                      file_name: Optional[str] = None,
+                      definition_text: Optional[str] = None) -> Optional[Tuple[str, tuple]]:
+    """
+    Build an UPDATE of a CLEX definition that writes only the given columns.
+    
+    Leaving a large definition_text untouched keeps SQLite from rewriting
+    its overflow pages when only the folder or file name changed.
+    
+    Args:
+        device_id: The ID of the device
+        folder_path: New folder path, or None to keep it
+        file_name: New file name, or None to keep it
+        definition_text: New CLEX definition text, or None to keep it
+        
+    Returns:
+        Tuple of (sql, parameters), or None if no column is given
+    """
+    columns = []
+    params = []
+    for column, value in (("folder_path", folder_path), ("file_name", file_name),
+                          ("definition_text", definition_text)):
+        if value is not None:
+            columns.append(f"{column} = ?")
+            params.append(value)
+    if not columns:
+        return None
+    params.append(device_id)
+    return f"UPDATE clex_definitions SET {', '.join(columns)} WHERE device_id = ?", tuple(params)
+
+class DuplicateDeviceError(sqlite3.IntegrityError):
+    """Raised when a device name already exists in the target technology."""
+    pass
+
+def is_duplicate_device_error(error: sqlite3.IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError comes from the unique device name index.
+    
+    Args:
+        error: Error raised by an insert into devices
+        
+    Returns:
+        True if the (technology_id, name) uniqueness was violated, False for
+        any other constraint
+    """
+    return "devices.technology_id, devices.name" in str(error)
+
 class DatabaseManager:
     """
     Manages all database operations for the CLEX Browser application.
@@ -19,10 +541,21 @@ class DatabaseManager:
             db_file: Path to the SQLite database file
         """
         self.db_file = db_file
+        self._conn = None
+        # Whether the full-text index over definitions exists; set by ensure_indexes
+        self._has_fts = False
+        # Whether uq_devices_tech_name exists; set by ensure_indexes. A database
+        # that already holds duplicate names cannot get it
+        self._has_unique_device_index = False
+        # Serializes access to the shared connection across pool threads
+        self._lock = threading.RLock()
         
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Get a database connection.
+        Get the persistent database connection, opening it on first use.
+        
+        The connection is shared with QThreadPool workers, so callers must
+        hold self._lock while using it.
         
         Returns:
             A connection to the SQLite database
@@ -30,27 +563,170 @@ class DatabaseManager:
         Raises:
             sqlite3.Error: If connection cannot be established
         """
-        if not os.path.exists(self.db_file):
-            raise FileNotFoundError(f"Database file not found: {self.db_file}")
-        return sqlite3.connect(self.db_file)
+        if self._conn is None:
+            if not os.path.exists(self.db_file):
+                raise FileNotFoundError(f"Database file not found: {self.db_file}")
+            # Autocommit: reads run without a transaction, writers use _transaction
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False,
+                                         isolation_level=None)
+            # Serve reads from a memory map instead of copying pages through read()
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            self.ensure_indexes()
+        return self._conn
+    
+    def ensure_indexes(self):
+        """
+        Create the indexes, constraints and triggers the application relies on.
+        
+        Runs once when the persistent connection is opened; every statement
+        uses IF NOT EXISTS so it is a no-op on an already migrated database.
+        """
+        with self._lock:
+            try:
+                # Device names are unique per technology, so inserts can rely
+                # on the constraint instead of checking first
+                self._conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_devices_tech_name "
+                    "ON devices(technology_id, name)"
+                )
+                self._has_unique_device_index = True
+            except sqlite3.IntegrityError as e:
+                print(f"Warning: could not create unique device index: {e}")
+                self._has_unique_device_index = False
+            self._conn.execute(SQL_CREATE_CLEX_DELETE_TRIGGER)
+            self._conn.execute(SQL_CREATE_CLEX_DEVICE_INDEX)
+            self._conn.execute(SQL_CREATE_DEVICE_TECH_NAME_INDEX)
+            self._has_fts = ensure_search_indexes(self._conn)
+    
+    @contextmanager
+    def _transaction(self):
+        """
+        Run a block of writes in one explicit transaction.
+        
+        Holds the connection lock for the duration, commits on success
+        and rolls back if the block raises.
+        
+        Yields:
+            The persistent database connection
+        """
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def close(self):
+        """Close the persistent database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _db_file_key(self) -> Optional[Tuple]:
+        """
+        Identify the current on-disk state of the database file.
+        
+        In WAL mode committed writes stay in the -wal file until a
+        checkpoint, so its size and mtime are part of the key as well.
+        
+        Returns:
+            Tuple of (absolute path, size, mtime in ns, WAL size, WAL mtime in ns),
+            with the WAL fields None when there is no -wal file, or None if the
+            database file is missing
+        """
+        try:
+            st = os.stat(self.db_file)
+        except OSError:
+            return None
+        try:
+            wal = os.stat(self.db_file + "-wal")
+            wal_key = (wal.st_size, wal.st_mtime_ns)
+        except OSError:
+            wal_key = (None, None)
+        return (os.path.abspath(self.db_file), st.st_size, st.st_mtime_ns) + wal_key
+    
+    def _tech_cache_path(self) -> Optional[str]:
+        """
+        Get the path of the technology cache file.
+        
+        Returns:
+            Path inside the application cache directory, or None if unavailable
+        """
+        cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        if not cache_dir:
+            return None
+        return os.path.join(cache_dir, TECH_CACHE_FILE)
+    
+    def _load_cached_technologies(self, key) -> Optional[List[Tuple[int, str, str]]]:
+        """
+        Load the technology list cached by a previous run.
+        
+        Args:
+            key: Current database file key from _db_file_key
+            
+        Returns:
+            The cached technologies if the cache matches key, otherwise None
+        """
+        cache_path = self._tech_cache_path()
+        if key is None or not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, technologies = pickle.load(f)
+        except Exception:
+            return None
+        return technologies if cached_key == key else None
+    
+    def _save_cached_technologies(self, technologies: List[Tuple[int, str, str]]):
+        """
+        Cache the technology list for the next run.
+        
+        Args:
+            technologies: List of tuples containing (id, name, version)
+        """
+        cache_path = self._tech_cache_path()
+        key = self._db_file_key()
+        if key is None or not cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((key, technologies), f)
+        except OSError as e:
+            print(f"Warning: could not write technology cache: {e}")
     
     def get_technologies(self) -> List[Tuple[int, str, str]]:
         """
         Retrieve all technologies from the database.
         
+        The result is cached on disk keyed by the size and modification time
+        of the database file and its -wal file, so an unchanged database is
+        not queried again on the next start.
+        
         Returns:
             List of tuples containing (id, name, version)
             
         Raises:
             sqlite3.Error: If a database error occurs
         """
+        cached = self._load_cached_technologies(self._db_file_key())
+        if cached is not None:
+            return cached
+        
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
-                return cursor.fetchall()
+                technologies = cursor.fetchall()
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to load technologies: {e}")
+        
+        self._save_cached_technologies(technologies)
+        return technologies
     
     def get_devices(self, tech_id: int) -> List[Tuple[int, str, int]]:
         """
@@ -66,8 +742,8 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 cursor.execute(
                     "SELECT id, name, has_clex_definition FROM devices WHERE technology_id = ? ORDER BY name", 
                     (tech_id,)
@@ -90,8 +766,8 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 # Get total devices
                 cursor.execute("SELECT COUNT(*) FROM devices WHERE technology_id = ?", (tech_id,))
                 total_devices = cursor.fetchone()[0]
@@ -133,8 +809,8 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 cursor.execute(
                     "SELECT folder_path, file_name, definition_text FROM clex_definitions WHERE device_id = ?", 
                     (device_id,)
@@ -157,8 +833,8 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 cursor.execute(
                     "SELECT technology_id, name, has_clex_definition FROM devices WHERE id = ?", 
                     (device_id,)
@@ -167,16 +843,39 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to get device info: {e}")
     
-    def update_clex_definition(self, device_id: int, folder_path: str, file_name: str, 
-                               definition_text: str) -> bool:
+    def get_device_with_clex(self, device_id: int) -> Optional[Tuple[str, str, str, str, str, str]]:
         """
-        Update an existing CLEX definition.
+        Get a device together with its technology and CLEX definition.
         
         Args:
             device_id: The ID of the device
-            folder_path: The folder path
-            file_name: The file name
-            definition_text: The CLEX definition text
+            
+        Returns:
+            Tuple containing (device_name, tech_name, tech_version, folder_path,
+            file_name, definition_text) or None if the device is not found;
+            the last three are None if the device has no CLEX definition
+            
+        Raises:
+            sqlite3.Error: If a database error occurs
+        """
+        try:
+            with self._lock:
+                cursor = self._get_connection().cursor()
+                cursor.execute(SQL_DEVICE_WITH_CLEX, (device_id,))
+                return cursor.fetchone()
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Failed to load CLEX definition: {e}")
+    
+    def update_clex_definition(self, device_id: int, folder_path: Optional[str], 
+                               file_name: Optional[str], definition_text: Optional[str]) -> bool:
+        """
+        Update an existing CLEX definition, writing only the given columns.
+        
+        Args:
+            device_id: The ID of the device
+            folder_path: The folder path, or None to keep it
+            file_name: The file name, or None to keep it
+            definition_text: The CLEX definition text, or None to keep it
             
         Returns:
             True if successful, False otherwise
@@ -184,15 +883,14 @@ class DatabaseManager:
         Raises:
             sqlite3.Error: If a database error occurs
         """
+        update = build_clex_update(device_id, folder_path, file_name, definition_text)
+        if update is None:
+            return False
+        
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE clex_definitions SET folder_path = ?, file_name = ?, definition_text = ? "
-                    "WHERE device_id = ?", 
-                    (folder_path, file_name, definition_text, device_id)
-                )
-                conn.commit()
+                cursor.execute(*update)
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to update CLEX definition: {e}")
@@ -215,7 +913,7 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 # First update the device to indicate it has a CLEX definition
                 cursor.execute(
@@ -229,7 +927,6 @@ class DatabaseManager:
                     "VALUES (?, ?, ?, ?)", 
                     (device_id, folder_path, file_name, definition_text)
                 )
-                conn.commit()
                 return True
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to add CLEX definition: {e}")
@@ -248,14 +945,10 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
-                # Delete the CLEX definition
+                # Delete the CLEX definition; trg_clex_delete clears the device flag
                 cursor.execute("DELETE FROM clex_definitions WHERE device_id = ?", (device_id,))
-                
-                # Update the device to indicate it no longer has a CLEX definition
-                cursor.execute("UPDATE devices SET has_clex_definition = 0 WHERE id = ?", (device_id,))
-                conn.commit()
                 return True
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to delete CLEX definition: {e}")
@@ -276,11 +969,24 @@ class DatabaseManager:
             ID of the newly created device
             
         Raises:
+            DuplicateDeviceError: If the technology already has a device with this name
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
+                # Without the unique index nothing rejects a duplicate name, so
+                # check for one inside the same transaction
+                if not self._has_unique_device_index:
+                    cursor.execute(
+                        "SELECT 1 FROM devices WHERE name = ? AND technology_id = ?",
+                        (device_name, tech_id)
+                    )
+                    if cursor.fetchone() is not None:
+                        raise DuplicateDeviceError(
+                            f"A device named '{device_name}' already exists in this technology."
+                        )
+                
                 # Create a new device
                 cursor.execute(
                     "INSERT INTO devices (name, technology_id, has_clex_definition) VALUES (?, ?, 1)", 
@@ -294,8 +1000,15 @@ class DatabaseManager:
                     "VALUES (?, ?, ?, ?)", 
                     (device_id, folder_path, file_name, definition_text)
                 )
-                conn.commit()
                 return device_id
+        except DuplicateDeviceError:
+            raise
+        except sqlite3.IntegrityError as e:
+            if not is_duplicate_device_error(e):
+                raise sqlite3.Error(f"Failed to create device with CLEX definition: {e}")
+            raise DuplicateDeviceError(
+                f"A device named '{device_name}' already exists in this technology."
+            ) from e
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to create device with CLEX definition: {e}")
     
@@ -314,8 +1027,8 @@ class DatabaseManager:
             sqlite3.Error: If a database error occurs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self._get_connection().cursor()
                 cursor.execute(
                     "SELECT COUNT(*) FROM devices WHERE name = ? AND technology_id = ?", 
                     (device_name, tech_id)
@@ -325,7 +1038,9 @@ class DatabaseManager:
             raise sqlite3.Error(f"Failed to check device name: {e}")
     
     def search_devices_and_clex(self, search_text: str, case_sensitive: bool = False, 
-                              search_devices: bool = True, search_defs: bool = True) -> List[Tuple]:
+                              search_devices: bool = True, search_defs: bool = True,
+                              prefix_match: bool = False,
+                              cancel_event: Optional[threading.Event] = None) -> List[Tuple]:
         """
         Search for devices and CLEX definitions.
         
@@ -334,55 +1049,49 @@ class DatabaseManager:
             case_sensitive: Whether to use case-sensitive search
             search_devices: Whether to search device names
             search_defs: Whether to search CLEX definitions
+            prefix_match: Whether device names must start with the text
+            cancel_event: Optional event that stops the search early when set
             
         Returns:
-            List of search results
+            List of search results, partial if the search was cancelled
+            
+        Raises:
+            sqlite3.Error: If a database error occurs
+        """
+        return [row for batch in self.iter_search_devices_and_clex(
+                    search_text, case_sensitive, search_devices, search_defs,
+                    prefix_match, cancel_event)
+                for row in batch]
+    
+    def iter_search_devices_and_clex(self, search_text: str, case_sensitive: bool = False,
+                                     search_devices: bool = True, search_defs: bool = True,
+                                     prefix_match: bool = False,
+                                     cancel_event: Optional[threading.Event] = None
+                                     ) -> Iterator[List[Tuple]]:
+        """
+        Search for devices and CLEX definitions, streaming the results.
+        
+        Runs iter_search_results on the persistent connection, holding the
+        lock until the generator is exhausted or closed.
+        
+        Args:
+            search_text: Text to search for
+            case_sensitive: Whether to use case-sensitive search
+            search_devices: Whether to search device names
+            search_defs: Whether to search CLEX definitions
+            prefix_match: Whether device names must start with the text
+            cancel_event: Optional event that stops the search early when set
+            
+        Yields:
+            Non-empty lists of search results
             
         Raises:
             sqlite3.Error: If a database error occurs
         """
-        results = []
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                if search_devices:
-                    query = (
-                        "SELECT d.id, d.name, t.name, t.id FROM devices d "
-                        "JOIN technologies t ON d.technology_id = t.id WHERE " + 
-                        ("d.name LIKE ?" if case_sensitive else "LOWER(d.name) LIKE LOWER(?)") + 
-                        " ORDER BY t.name, d.name"
-                    )
-                    cursor.execute(query, (f"%{search_text}%",))
-                    for device_id, device_name, tech_name, tech_id in cursor.fetchall():
-                        results.append((device_id, device_name, tech_name, tech_id, "Device Name", device_name))
-                
-                if search_defs:
-                    query = (
-                        "SELECT d.id, d.name, t.name, t.id, c.definition_text FROM clex_definitions c "
-                        "JOIN devices d ON c.device_id = d.id "
-                        "JOIN technologies t ON d.technology_id = t.id WHERE " + 
-                        ("c.definition_text LIKE ?" if case_sensitive else "LOWER(c.definition_text) LIKE LOWER(?)") + 
-                        " ORDER BY t.name, d.name"
-                    )
-                    cursor.execute(query, (f"%{search_text}%",))
-                    for device_id, device_name, tech_name, tech_id, definition_text in cursor.fetchall():
-                        match_pos = (
-                            definition_text.find(search_text) if case_sensitive 
-                            else definition_text.lower().find(search_text.lower())
-                        )
-                        if match_pos >= 0:
-                            start_line = (
-                                definition_text.rfind('\n', 0, match_pos) + 1 
-                                if definition_text.rfind('\n', 0, match_pos) >= 0 else 0
-                            )
-                            end_line = (
-                                definition_text.find('\n', match_pos) 
-                                if definition_text.find('\n', match_pos) >= 0 else len(definition_text)
-                            )
-                            context = definition_text[start_line:end_line]
-                            results.append((device_id, device_name, tech_name, tech_id, "CLEX Definition", context))
-                
-                return results
+            with self._lock:
+                yield from iter_search_results(
+                    self._get_connection(), search_text, case_sensitive, search_devices,
+                    search_defs, prefix_match, self._has_fts, cancel_event)
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to perform search: {e}")
\ No newline at end of file
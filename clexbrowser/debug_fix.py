@@ -1,51 +1,25 @@
 import sys
-import sqlite3
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import QTimer, Qt
-from clex_browser import EnhancedCLEXBrowser
-
-class EmergencyOverlayRemover(QTimer):
-    """Safety timer that automatically hides any visible loading overlays."""
-    
-    def __init__(self, browser):
-        super().__init__()
-        self.browser = browser
-        self.setSingleShot(True)
-        self.timeout.connect(self.emergency_hide)
-    
-    def emergency_hide(self):
-        print("EMERGENCY: Forcibly hiding loading overlay")
-        if hasattr(self.browser, 'loading_overlay') and self.browser.loading_overlay.isVisible():
-            self.browser.loading_overlay.hide()
-        if hasattr(self.browser, 'status_indicator'):
-            self.browser.status_indicator.reset()
-        # Force UI update
-        QApplication.processEvents()
+from PyQt5.QtCore import QTimer, Qt, QThreadPool
+from clex_browser import EnhancedCLEXBrowser, HAS_CLEX_ROLE
+from workers import DbTask
 
 class SuperFixedCLEXBrowser(EnhancedCLEXBrowser):
-    """Aggressively fixed version with direct database access for all operations."""
+    """Fixed version that runs selection reads on the global QThreadPool."""
     
     def __init__(self, db_file):
-        """Initialize with safety mechanism."""
+        """Initialize the browser."""
         super().__init__(db_file)
         
-        # Create emergency timeout
-        self.emergency_timer = EmergencyOverlayRemover(self)
-        
-        # Completely disable all background loading to diagnose the issue
-        print("Disabling all background loading")
+        # Worker threads are replaced by DbTask runnables on the global pool
+        print("Disabling QThread background loading")
         
     def load_technologies(self):
-        """Override to use direct database access for initial loading."""
+        """Override to load technologies synchronously for initial loading."""
         print("Direct technology loading started")
-        self.emergency_timer.start(5000)  # 5 seconds safety timeout
         
-        # Direct database access
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
-        technologies = cursor.fetchall()
-        conn.close()
+        # Read through the manager's persistent connection
+        technologies = self.db_manager.get_technologies()
         
         # Process results directly
         print(f"Directly loaded {len(technologies)} technologies")
@@ -67,12 +41,10 @@ class SuperFixedCLEXBrowser(EnhancedCLEXBrowser):
         if hasattr(self, 'status_bar'):
             self.status_bar.showMessage(f"Loaded {len(self.technologies)} technologies")
         
-        # Cancel emergency timer
-        self.emergency_timer.stop()
         print("Direct technology loading completed")
     
     def on_tech_select(self, current, previous):
-        """Completely override tech selection to use direct database access."""
+        """Load devices and statistics for the selected technology on the thread pool."""
         if not current:
             return
             
@@ -80,139 +52,97 @@ class SuperFixedCLEXBrowser(EnhancedCLEXBrowser):
         self.current_tech_id = tech_id
         tech_name = current.text().split(" v")[0]
         
-        print(f"Direct device loading for technology: {tech_name} (ID: {tech_id})")
-        self.emergency_timer.start(5000)  # 5 seconds safety timeout
+        print(f"Device loading for technology: {tech_name} (ID: {tech_id})")
         
-        try:
-            # Manually hide any existing loading overlay
-            if hasattr(self, 'loading_overlay') and self.loading_overlay.isVisible():
-                self.loading_overlay.hide()
-            
-            # Direct database access
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Get devices
-            cursor.execute(
-                "SELECT id, name, has_clex_definition FROM devices WHERE technology_id = ? ORDER BY name", 
-                (tech_id,)
-            )
-            devices = cursor.fetchall()
-            
-            # Get statistics
-            cursor.execute(
-                "SELECT COUNT(*) FROM devices WHERE technology_id = ? AND has_clex_definition = 1", 
-                (tech_id,)
-            )
-            clex_count = cursor.fetchone()[0]
-            
-            cursor.execute(
-                "SELECT COUNT(*) FROM clex_definitions c JOIN devices d ON c.device_id = d.id "
-                "WHERE d.technology_id = ?", 
-                (tech_id,)
-            )
-            total_clex = cursor.fetchone()[0]
-            
-            # Close connection
-            conn.close()
-            
-            # Update device state
-            self.devices = devices
-            self.all_devices = self.devices.copy()
-            
-            # Update statistics directly
-            self.update_statistics(
-                len(self.devices),
-                clex_count,
-                total_clex
-            )
-            
-            # Update device list directly
-            self.update_device_listbox()
-            
-            # Clear CLEX display
-            self.clear_clex_display()
-            
-            print(f"Loaded {len(self.devices)} devices ({clex_count} with CLEX definitions)")
+        # Manually hide any existing loading overlay
+        if hasattr(self, 'loading_overlay') and self.loading_overlay.isVisible():
+            self.loading_overlay.hide()
+        self.status_indicator.start_indeterminate()
+        
+        task = DbTask(lambda: (self.db_manager.get_devices(tech_id),
+                               self.db_manager.get_tech_statistics(tech_id)))
+        task.signals.finished.connect(
+            lambda result: self.on_tech_data_loaded(tech_id, tech_name, result))
+        task.signals.error.connect(self.on_tech_data_error)
+        QThreadPool.globalInstance().start(task)
+    
+    def on_tech_data_loaded(self, tech_id, tech_name, result):
+        """
+        Handle devices and statistics loaded for a technology.
+        
+        Args:
+            tech_id: ID of the technology the task was started for
+            tech_name: Name of the technology
+            result: Tuple of (devices, statistics dictionary)
+        """
+        # Ignore results for a technology that is no longer selected
+        if tech_id != self.current_tech_id:
+            return
+        
+        devices, stats = result
+        
+        # Update device state
+        self.devices = devices
+        self.all_devices = self.devices.copy()
+        
+        # Update statistics directly
+        self.update_statistics(
+            stats["total_devices"],
+            stats["clex_devices"],
+            stats["total_clex"]
+        )
+        
+        # Update device list directly
+        self.update_device_listbox()
+        
+        # Clear CLEX display
+        self.clear_clex_display()
+        self.status_indicator.reset()
+        
+        print(f"Loaded {len(self.devices)} devices ({stats['clex_devices']} with CLEX definitions)")
+        
+        if hasattr(self, 'status_bar'):
+            self.status_bar.showMessage(f"Selected technology: {tech_name}")
             
-            if hasattr(self, 'status_bar'):
-                self.status_bar.showMessage(f"Selected technology: {tech_name}")
-                
-            if hasattr(self, 'settings'):
-                self.settings.setValue("last_tech_id", tech_id)
-                
-            # Force UI update
-            QApplication.processEvents()
-                
-        except Exception as e:
-            print(f"ERROR in direct device loading: {str(e)}")
-            if hasattr(self, 'status_bar'):
-                self.status_bar.showMessage(f"Error loading devices: {str(e)}")
+        if hasattr(self, 'settings'):
+            self.settings.setValue("last_tech_id", tech_id)
+        print("Device loading completed")
+    
+    def on_tech_data_error(self, error_message):
+        """
+        Handle a failed device load.
         
-        # Cancel emergency timer
-        self.emergency_timer.stop()
-        print("Direct device loading completed")
+        Args:
+            error_message: Error message from the task
+        """
+        print(f"ERROR in device loading: {error_message}")
+        self.status_indicator.reset()
+        if hasattr(self, 'status_bar'):
+            self.status_bar.showMessage(f"Error loading devices: {error_message}")
     
     def on_device_select(self, current, previous):
-        """Completely override device selection to use direct database access."""
+        """Load the CLEX definition for the selected device on the thread pool."""
         if not current:
             return
         
         device_id = current.data(Qt.UserRole)
         self.current_device_id = device_id
         device_name = current.text()
-        has_clex = current.font().bold()
+        has_clex = current.data(HAS_CLEX_ROLE)
         
-        print(f"Direct CLEX loading for device: {device_name} (ID: {device_id}, has_clex: {has_clex})")
+        print(f"CLEX loading for device: {device_name} (ID: {device_id}, has_clex: {has_clex})")
         
         # Manually hide any existing loading overlay
         if hasattr(self, 'loading_overlay') and self.loading_overlay.isVisible():
             self.loading_overlay.hide()
         
         if has_clex:
-            # Start safety timer
-            self.emergency_timer.start(5000)  # 5 seconds safety timeout
-            
-            try:
-                # Connect to database directly
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT folder_path, file_name, definition_text FROM clex_definitions WHERE device_id = ?", 
-                    (device_id,)
-                )
-                result = cursor.fetchone()
-                conn.close()
-                
-                # Process result
-                if result:
-                    folder_path, file_name, definition_text = result
-                    header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
-                    self.clex_text.clear()
-                    self.clex_text.setPlainText(header_text + definition_text)
-                    
-                    if hasattr(self, 'setWindowTitle'):
-                        self.setWindowTitle(f"Enhanced CLEX Browser - {device_name}")
-                        
-                    if hasattr(self, 'status_bar'):
-                        self.status_bar.showMessage(f"Loaded CLEX definition for '{device_name}'")
-                        
-                    print(f"Successfully loaded CLEX definition for '{device_name}'")
-                else:
-                    self.clear_clex_display()
-                    if hasattr(self, 'status_bar'):
-                        self.status_bar.showMessage(f"No CLEX definition found for '{device_name}'")
-                    print(f"No CLEX definition found for '{device_name}'")
-                
-            except Exception as e:
-                print(f"ERROR in direct CLEX loading: {str(e)}")
-                self.clear_clex_display()
-                if hasattr(self, 'status_bar'):
-                    self.status_bar.showMessage(f"Error loading CLEX definition: {str(e)}")
-            
-            # Cancel emergency timer
-            self.emergency_timer.stop()
-            
+            self.status_indicator.start_indeterminate()
+            task = DbTask(lambda: self.db_manager.get_clex_definition(device_id))
+            task.signals.finished.connect(
+                lambda result: self.on_device_data_loaded(device_id, device_name, result))
+            task.signals.error.connect(self.on_device_data_error)
+            QThreadPool.globalInstance().start(task)
         else:
             self.clear_clex_display()
             if hasattr(self, 'status_bar'):
@@ -225,11 +155,59 @@ class SuperFixedCLEXBrowser(EnhancedCLEXBrowser):
         # Save setting
         if hasattr(self, 'settings'):
             self.settings.setValue("last_device_id", device_id)
-        
-        # Force UI update
-        QApplication.processEvents()
         print("Device selection completed")
     
+    def on_device_data_loaded(self, device_id, device_name, result):
+        """
+        Handle a CLEX definition loaded for a device.
+        
+        Args:
+            device_id: ID of the device the task was started for
+            device_name: Name of the device
+            result: Tuple of (folder_path, file_name, definition_text) or None
+        """
+        # Ignore results for a device that is no longer selected
+        if device_id != self.current_device_id:
+            return
+        
+        self.status_indicator.reset()
+        if result:
+            folder_path, file_name, definition_text = result
+            header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
+            self.set_clex_text(header_text, definition_text)
+            
+            if hasattr(self, 'setWindowTitle'):
+                self.setWindowTitle(f"Enhanced CLEX Browser - {device_name}")
+                
+            if hasattr(self, 'status_bar'):
+                self.status_bar.showMessage(f"Loaded CLEX definition for '{device_name}'")
+                
+            print(f"Successfully loaded CLEX definition for '{device_name}'")
+        else:
+            self.clear_clex_display()
+            if hasattr(self, 'status_bar'):
+                self.status_bar.showMessage(f"No CLEX definition found for '{device_name}'")
+            print(f"No CLEX definition found for '{device_name}'")
+    
+    def on_device_data_error(self, error_message):
+        """
+        Handle a failed CLEX definition load.
+        
+        Args:
+            error_message: Error message from the task
+        """
+        print(f"ERROR in CLEX loading: {error_message}")
+        self.status_indicator.reset()
+        self.clear_clex_display()
+        if hasattr(self, 'status_bar'):
+            self.status_bar.showMessage(f"Error loading CLEX definition: {error_message}")
+    
+    def closeEvent(self, event):
+        """Wait for pending pool tasks before closing the shared connection."""
+        super().closeEvent(event)
+        QThreadPool.globalInstance().waitForDone(5000)
+        self.db_manager.close()
+    
     # Override all methods that use worker threads
     def load_devices(self, tech_id):
         """Do nothing - handled by on_tech_select."""
@@ -1,9 +1,34 @@
 # device_loader_test.py
 import sys
 import sqlite3
+import queue
+import threading
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel, QComboBox, QListWidget, QMessageBox
 from PyQt5.QtCore import QThread, pyqtSignal
 
+# Connections opened up front per database file and reused by workers
+POOL_SIZE = 4
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _new_conn(db_file):
+    """Open a read connection that any worker thread may use."""
+    conn = sqlite3.connect(db_file, check_same_thread=False)
+    conn.execute("PRAGMA query_only=ON")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def _get_pool(db_file):
+    """Return the connection pool for a database file, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(db_file)
+        if pool is None:
+            pool = queue.LifoQueue()
+            for _ in range(POOL_SIZE):
+                pool.put(_new_conn(db_file))
+            _pools[db_file] = pool
+        return pool
+
 class SimpleDeviceLoaderWorker(QThread):
     """Simplified worker for loading devices without complex signal structures."""
     result_signal = pyqtSignal(list)
@@ -16,19 +41,23 @@ class SimpleDeviceLoaderWorker(QThread):
         
     def run(self):
         try:
-            # Connect to database directly - simplest approach
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Execute a simple query
-            cursor.execute(
-                "SELECT id, name, has_clex_definition FROM devices WHERE technology_id = ? ORDER BY name", 
-                (self.tech_id,)
-            )
-            
-            # Fetch all results
-            devices = cursor.fetchall()
-            conn.close()
+            # Borrow an idle pooled connection; connections are read-only,
+            # so sharing them across worker threads is safe
+            pool = _get_pool(self.db_file)
+            conn = pool.get()
+            try:
+                cursor = conn.cursor()
+                
+                # Execute a simple query
+                cursor.execute(
+                    "SELECT id, name, has_clex_definition FROM devices WHERE technology_id = ? ORDER BY name", 
+                    (self.tech_id,)
+                )
+                
+                # Fetch all results
+                devices = cursor.fetchall()
+            finally:
+                pool.put(conn)
             
             # Send results back
             self.result_signal.emit(devices)
@@ -75,18 +104,34 @@ class DeviceLoaderTest(QMainWindow):
     def load_technologies(self):
         """Load technologies into combo box - direct database access for simplicity."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
-            technologies = cursor.fetchall()
-            conn.close()
+            pool = _get_pool(self.db_file)
+            conn = pool.get()
+            try:
+                cursor = conn.cursor()
+                # Build the display text in SQL: "name vX" or just "name" without a version
+                cursor.execute(
+                    "SELECT id, name || COALESCE(' v' || NULLIF(version, ''), '') "
+                    "FROM technologies ORDER BY name"
+                )
+                technologies = cursor.fetchall()
+            finally:
+                pool.put(conn)
             
-            for tech_id, tech_name, tech_version in technologies:
-                display_text = f"{tech_name} v{tech_version}" if tech_version else tech_name
-                self.tech_combo.addItem(display_text, tech_id)
+            # Adding the first item selects it; keep that from starting a load
+            # before the combo is populated
+            self.tech_combo.blockSignals(True)
+            try:
+                for tech_id, display_text in technologies:
+                    self.tech_combo.addItem(display_text, tech_id)
+            finally:
+                self.tech_combo.blockSignals(False)
                 
             self.status_label.setText(f"Loaded {len(technologies)} technologies")
             
+            # Load devices for the initially selected technology once
+            if technologies:
+                self.on_tech_selected(0)
+            
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to load technologies: {e}")
             self.status_label.setText("Error loading technologies")
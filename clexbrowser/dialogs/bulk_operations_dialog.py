@@ -1,12 +1,328 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QTableWidget, QTableWidgetItem,
+                            QPushButton, QTableView,
                             QHeaderView, QAbstractItemView, QCheckBox,
                             QComboBox, QFrame, QMessageBox, QProgressBar,
                             QLineEdit)
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
+from PyQt5.QtCore import (Qt, pyqtSignal, QSize, QAbstractTableModel, QModelIndex,
+                          QSortFilterProxyModel, QTimer, QThreadPool)
 from PyQt5.QtGui import QFont, QColor
 import sqlite3
-from typing import List, Dict, Any, Tuple, Optional, Callable
+import threading
+from array import array
+from itertools import islice
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterator, Iterable, Collection
+
+from database_manager import SQL_CREATE_CLEX_DELETE_TRIGGER, SQL_CREATE_DEVICE_TECH_NAME_INDEX
+from workers import DbStreamTask
+
+# Number of device ids bound per IN (...) statement; stays below
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER of 999 and bounds the
+# per-id retry work when a chunk fails
+DELETE_CHUNK_SIZE = 500
+
+# Statement template; full chunks format to the same string, so the
+# connection's statement cache reuses the compiled program. The device
+# flag is cleared by the trg_clex_delete trigger.
+SQL_DELETE_CLEX = "DELETE FROM clex_definitions WHERE device_id IN ({})"
+
+# Item queries, one per filter combination, so refresh_items passes a
+# fixed string and never builds SQL. Technology names come from a cached
+# id -> name dict; the all-technologies queries join only to order the
+# rows by technology name, with t.id breaking ties in index order.
+_Q_ALL_SELECT = (
+    "SELECT d.id, d.name, d.has_clex_definition, d.technology_id "
+    "FROM devices d JOIN technologies t ON d.technology_id = t.id "
+)
+_Q_ALL_ORDER = " ORDER BY t.name, t.id, d.name"
+_Q_ALL = _Q_ALL_SELECT + _Q_ALL_ORDER
+_Q_ALL_CLEX = _Q_ALL_SELECT + "WHERE d.has_clex_definition = 1" + _Q_ALL_ORDER
+_Q_TECH = (
+    "SELECT id, name, has_clex_definition, technology_id FROM devices "
+    "WHERE technology_id = ? ORDER BY name"
+)
+_Q_TECH_CLEX = (
+    "SELECT id, name, has_clex_definition, technology_id FROM devices "
+    "WHERE technology_id = ? AND has_clex_definition = 1 ORDER BY name"
+)
+
+# Rows fetched per chunk when loading items
+ITEM_FETCH_SIZE = 1000
+
+# Translation table flipping check bytes between 0 and 1
+_INVERT_CHECKS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+class BulkItemsModel(QAbstractTableModel):
+    """
+    Table model for the devices listed in the bulk operations dialog.
+    
+    Rows are stored as parallel arrays instead of one QTableWidgetItem per
+    cell, so loading allocates no Qt objects and the view only asks for
+    the cells it paints.
+    """
+    
+    HEADERS = ["", "Device", "Technology", "Has CLEX"]
+    
+    # Shared by every bolded cell; created on first use because a QFont
+    # cannot be built before the QApplication exists
+    _bold_font = None
+    
+    def __init__(self, parent=None):
+        """
+        Initialize an empty model.
+        
+        Args:
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._ids = array('q')
+        self._names = []
+        self._techs = []
+        self._tech_ids = array('q')
+        self._has_clex = bytearray()
+        self._checked = bytearray()
+        # Checked rows keyed by device id, maintained as check states change
+        # so collecting and counting the selection never sweeps the table
+        self._selected: Dict[int, Tuple[int, str, int, str]] = {}
+    
+    def set_rows(self, rows: List[Tuple[int, str, int, int]], tech_names: Dict[int, str]):
+        """
+        Replace the model contents.
+        
+        Args:
+            rows: Tuples of (device_id, device_name, has_clex, tech_id)
+            tech_names: Mapping of technology id to name
+        """
+        self.beginResetModel()
+        self._ids = array('q', [row[0] for row in rows])
+        self._names = [row[1] for row in rows]
+        self._has_clex = bytearray(1 if row[2] else 0 for row in rows)
+        self._tech_ids = array('q', [row[3] for row in rows])
+        self._techs = [tech_names.get(row[3], "") for row in rows]
+        self._checked = bytearray(len(rows))
+        self._selected = {}
+        self.endResetModel()
+    
+    def append_rows(self, rows: List[Tuple[int, str, int, int]], tech_names: Dict[int, str]):
+        """
+        Append rows to the end of the model.
+        
+        Args:
+            rows: Tuples of (device_id, device_name, has_clex, tech_id)
+            tech_names: Mapping of technology id to name
+        """
+        if not rows:
+            return
+        start = len(self._ids)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._ids.extend(row[0] for row in rows)
+        self._names.extend(row[1] for row in rows)
+        self._has_clex.extend(1 if row[2] else 0 for row in rows)
+        self._tech_ids.extend(row[3] for row in rows)
+        self._techs.extend(tech_names.get(row[3], "") for row in rows)
+        self._checked.extend(bytes(len(rows)))
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Return the number of rows."""
+        return 0 if parent.isValid() else len(self._ids)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Return the data for a cell."""
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        
+        if role == Qt.DisplayRole:
+            if column == 1:
+                return self._names[row]
+            if column == 2:
+                return self._techs[row]
+            if column == 3:
+                return "Yes" if self._has_clex[row] else "No"
+        elif role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        elif role == Qt.FontRole and column == 1 and self._has_clex[row]:
+            if BulkItemsModel._bold_font is None:
+                BulkItemsModel._bold_font = QFont()
+                BulkItemsModel._bold_font.setBold(True)
+            return BulkItemsModel._bold_font
+        return None
+    
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        """Toggle the check state of a row."""
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        row = index.row()
+        if value == Qt.Checked:
+            self._checked[row] = 1
+            self._selected[self._ids[row]] = self._row_item(row)
+        else:
+            self._checked[row] = 0
+            self._selected.pop(self._ids[row], None)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+    
+    def flags(self, index: QModelIndex):
+        """Return the item flags for a cell."""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsUserCheckable | Qt.ItemIsEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+    
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole):
+        """Return the column headers."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def set_all_checked(self, checked: bool):
+        """
+        Check or uncheck every row.
+        
+        Args:
+            checked: New check state
+        """
+        self._checked = bytearray(b"\x01" * len(self._checked)) if checked else bytearray(len(self._checked))
+        self._selected = (
+            {self._ids[row]: self._row_item(row) for row in range(len(self._checked))}
+            if checked else {}
+        )
+        self._check_column_changed()
+    
+    def invert_checked(self):
+        """Invert the check state of every row."""
+        self._checked = self._checked.translate(_INVERT_CHECKS)
+        self._selected = {
+            self._ids[row]: self._row_item(row)
+            for row, checked in enumerate(self._checked) if checked
+        }
+        self._check_column_changed()
+    
+    def set_rows_checked(self, rows: Iterable[int], checked: bool):
+        """
+        Check or uncheck the given rows.
+        
+        Args:
+            rows: Row numbers to change
+            checked: New check state
+        """
+        for row in rows:
+            if checked:
+                self._checked[row] = 1
+                self._selected[self._ids[row]] = self._row_item(row)
+            else:
+                self._checked[row] = 0
+                self._selected.pop(self._ids[row], None)
+        self._check_column_changed()
+    
+    def invert_rows_checked(self, rows: Iterable[int]):
+        """
+        Invert the check state of the given rows.
+        
+        Args:
+            rows: Row numbers to change
+        """
+        for row in rows:
+            if self._checked[row]:
+                self._checked[row] = 0
+                self._selected.pop(self._ids[row], None)
+            else:
+                self._checked[row] = 1
+                self._selected[self._ids[row]] = self._row_item(row)
+        self._check_column_changed()
+    
+    def row_matches(self, row: int, text: str) -> bool:
+        """
+        Check whether a row's device or technology name contains a string.
+        
+        Args:
+            row: Row number
+            text: Lowercase search text
+            
+        Returns:
+            True if either name contains the text, ignoring case
+        """
+        return text in self._names[row].lower() or text in self._techs[row].lower()
+    
+    def checked_count(self) -> int:
+        """Return the number of checked rows."""
+        return len(self._selected)
+    
+    def checked_items(self) -> Collection[Tuple[int, str, int, str]]:
+        """
+        Get the checked rows.
+        
+        Returns a live view rather than a copy; it must not be iterated
+        while check states can change.
+        
+        Returns:
+            Collection of tuples (device_id, device_name, tech_id, tech_name)
+        """
+        return self._selected.values()
+    
+    def _row_item(self, row: int) -> Tuple[int, str, int, str]:
+        """Return (device_id, device_name, tech_id, tech_name) for a row."""
+        return (self._ids[row], self._names[row], self._tech_ids[row], self._techs[row])
+    
+    def _check_column_changed(self):
+        """Notify views that the whole check column changed."""
+        if self._checked:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._checked) - 1, 0),
+                                  [Qt.CheckStateRole])
+
+class BulkItemsFilterModel(QSortFilterProxyModel):
+    """
+    Proxy that filters the bulk items by device or technology name.
+    
+    Filtering happens on the rows already loaded, so changing the search
+    text needs no database query.
+    """
+    
+    def __init__(self, parent=None):
+        """
+        Initialize the proxy with an empty search text.
+        
+        Args:
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._search_text = ""
+    
+    def search_text(self) -> str:
+        """Return the current lowercase search text."""
+        return self._search_text
+    
+    def set_search_text(self, text: str):
+        """
+        Filter rows to those whose device or technology name contains the text.
+        
+        Args:
+            text: Search text; case is ignored
+        """
+        text = text.strip().lower()
+        if text != self._search_text:
+            self._search_text = text
+            self.invalidateFilter()
+    
+    def visible_source_rows(self) -> Iterator[int]:
+        """
+        Iterate over the source rows that pass the filter.
+        
+        Yields:
+            Source model row numbers
+        """
+        for row in range(self.rowCount()):
+            yield self.mapToSource(self.index(row, 0)).row()
+    
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        """Accept rows matching the search text."""
+        return not self._search_text or self.sourceModel().row_matches(source_row, self._search_text)
+
 
 class BulkOperationsDialog(QDialog):
     """
@@ -35,10 +351,66 @@ class BulkOperationsDialog(QDialog):
         self.selected_items = []
         self.operation_handlers = {}
         
+        # One connection for the lifetime of the dialog, shared with the item
+        # queries running on the thread pool; the lock serializes its use
+        self._conn = sqlite3.connect(db_file, isolation_level=None, cached_statements=256,
+                                     check_same_thread=False)
+        self._conn_lock = threading.RLock()
+        # Bumped per refresh so results of superseded queries are dropped
+        self._query_epoch = 0
+        # Epoch whose rows the model currently holds
+        self._rows_epoch = 0
+        # Set while widgets are adjusted programmatically
+        self._suppress_refresh = False
+        # One-slot cache of the last completed item query: its
+        # (scope, tech_id, only_with_clex) key and rows
+        self._query_key = None
+        self._loading_rows = []
+        self._last_key = None
+        self._last_rows = []
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self.ensure_indexes()
+        
+        # Technology names by id, so item queries need not join for them;
+        # reloaded after each operation
+        self._tech_names: Dict[int, str] = {}
+        self.load_tech_names()
+        self.operationCompleted.connect(self.load_tech_names)
+        
         self.setWindowTitle("Bulk Operations")
         self.resize(800, 600)
         self.setup_ui()
     
+    def ensure_indexes(self):
+        """Create the indexes and triggers the dialog relies on if they do not exist."""
+        with self._conn_lock:
+            # Covering indexes that return the item rows already in display
+            # order, so the ORDER BY needs no temp B-tree sort
+            self._conn.execute(SQL_CREATE_DEVICE_TECH_NAME_INDEX)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tech_name ON technologies(name)")
+            self._conn.execute(SQL_CREATE_CLEX_DELETE_TRIGGER)
+    
+    def load_tech_names(self):
+        """Reload the technology id to name mapping."""
+        with self._conn_lock:
+            self._tech_names = dict(self._conn.execute("SELECT id, name FROM technologies"))
+    
+    def done(self, result: int):
+        """
+        Close the dialog and its database connection.
+        
+        Args:
+            result: Dialog result code
+        """
+        # Drop the results of any refresh still running
+        self._query_epoch += 1
+        with self._conn_lock:
+            self._conn.close()
+        super().done(result)
+    
     def setup_ui(self):
         """Set up the dialog UI."""
         layout = QVBoxLayout()
@@ -79,6 +451,9 @@ class BulkOperationsDialog(QDialog):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Filter by name...")
         self.search_input.textChanged.connect(self.on_search_changed)
+        # Coalesces a burst of keystrokes into a single filter pass
+        self._search_debounce = QTimer(self, singleShot=True, interval=150)
+        self._search_debounce.timeout.connect(self.apply_search_filter)
         search_layout.addWidget(self.search_input)
         header_layout.addLayout(search_layout)
         
@@ -91,11 +466,16 @@ class BulkOperationsDialog(QDialog):
         layout.addWidget(separator)
         
         # Items table
-        self.items_table = QTableWidget()
+        self.items_model = BulkItemsModel(self)
+        self.items_model.dataChanged.connect(self.update_selection_count)
+        self.items_proxy = BulkItemsFilterModel(self)
+        self.items_proxy.setSourceModel(self.items_model)
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_proxy)
         self.items_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.items_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.items_table.setColumnCount(4)
-        self.items_table.setHorizontalHeaderLabels(["", "Device", "Technology", "Has CLEX"])
+        self.items_table.setColumnWidth(0, 30)  # Checkbox column
+        self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
         self.items_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.items_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
         self.items_table.verticalHeader().setVisible(False)
@@ -169,12 +549,19 @@ class BulkOperationsDialog(QDialog):
         """
         operation = self.operation_combo.currentText()
         
-        # Adjust UI based on operation type
-        if operation == "Delete CLEX Definitions":
-            self.only_with_clex_check.setChecked(True)
-            self.only_with_clex_check.setEnabled(False)
-        else:
-            self.only_with_clex_check.setEnabled(True)
+        # Adjust UI based on operation type without each change triggering
+        # its own refresh; a single refresh follows
+        self._suppress_refresh = True
+        self.only_with_clex_check.blockSignals(True)
+        try:
+            if operation == "Delete CLEX Definitions":
+                self.only_with_clex_check.setChecked(True)
+                self.only_with_clex_check.setEnabled(False)
+            else:
+                self.only_with_clex_check.setEnabled(True)
+        finally:
+            self.only_with_clex_check.blockSignals(False)
+            self._suppress_refresh = False
         
         self.refresh_items()
     
@@ -194,124 +581,157 @@ class BulkOperationsDialog(QDialog):
         Args:
             text: Current search text
         """
-        self.refresh_items()
+        self._search_debounce.start()
+    
+    def apply_search_filter(self):
+        """Filter the loaded items by the current search text."""
+        text = self.search_input.text()
+        if text.strip().lower() == self.items_proxy.search_text():
+            return
+        
+        # Checks on rows about to be hidden must not be acted on unseen
+        self.items_model.set_all_checked(False)
+        self.items_proxy.set_search_text(text)
     
     def refresh_items(self):
-        """Load or refresh the list of items based on current settings."""
+        """
+        Load or refresh the list of items based on current settings.
+        
+        The query runs on the global thread pool; starting a new refresh
+        supersedes any that is still in flight.
+        """
+        if self._suppress_refresh:
+            return
+        
         scope = self.scope_combo.currentData()
         only_with_clex = self.only_with_clex_check.isChecked()
-        search_text = self.search_input.text().strip().lower()
         
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Determine technology filter
-            tech_filter = ""
-            tech_params = []
-            
-            if scope == "current_tech" and hasattr(self.parent, "current_tech_id"):
-                tech_id = self.parent.current_tech_id
-                if tech_id:
-                    tech_filter = "WHERE d.technology_id = ?"
-                    tech_params.append(tech_id)
-            
-            # Build query
-            query = (
-                "SELECT d.id, d.name, t.name, d.has_clex_definition, t.id "
-                "FROM devices d JOIN technologies t ON d.technology_id = t.id "
-            )
-            
-            params = tech_params.copy()
-            
-            if tech_filter:
-                query += tech_filter
-            
-            if only_with_clex:
-                if tech_filter:
-                    query += " AND d.has_clex_definition = 1"
-                else:
-                    query += "WHERE d.has_clex_definition = 1"
-            
-            query += " ORDER BY t.name, d.name"
-            
-            # Execute query
-            cursor.execute(query, params)
-            items = cursor.fetchall()
-            conn.close()
-            
-            # Filter by search text if needed
-            if search_text:
-                items = [
-                    item for item in items
-                    if search_text in item[1].lower() or search_text in item[2].lower()
-                ]
-            
-            # Populate table
-            self.items_table.clearContents()
-            self.items_table.setRowCount(len(items))
-            
-            for row, (device_id, device_name, tech_name, has_clex, tech_id) in enumerate(items):
-                # Checkbox cell
-                checkbox = QTableWidgetItem()
-                checkbox.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-                checkbox.setCheckState(Qt.Unchecked)
-                self.items_table.setItem(row, 0, checkbox)
-                
-                # Device name cell
-                device_item = QTableWidgetItem(device_name)
-                device_item.setData(Qt.UserRole, (device_id, tech_id))
-                if has_clex:
-                    font = QFont()
-                    font.setBold(True)
-                    device_item.setFont(font)
-                self.items_table.setItem(row, 1, device_item)
-                
-                # Technology name cell
-                tech_item = QTableWidgetItem(tech_name)
-                self.items_table.setItem(row, 2, tech_item)
-                
-                # Has CLEX cell
-                clex_item = QTableWidgetItem("Yes" if has_clex else "No")
-                self.items_table.setItem(row, 3, clex_item)
-            
-            # Adjust column widths
-            self.items_table.setColumnWidth(0, 30)  # Checkbox column
-            self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
-            
-            # Update selection label
+        tech_id = None
+        if scope == "current_tech" and hasattr(self.parent, "current_tech_id"):
+            tech_id = self.parent.current_tech_id
+        
+        # Repeat of the last completed query; reuse its rows
+        key = (scope, tech_id, only_with_clex)
+        if key == self._last_key:
+            self._query_epoch += 1
+            self._rows_epoch = self._query_epoch
+            self.items_model.set_rows(self._last_rows, self._tech_names)
             self.update_selection_count()
+            return
+        
+        # Pick the prepared query for the filter combination
+        if tech_id and only_with_clex:
+            query, params = _Q_TECH_CLEX, (tech_id,)
+        elif tech_id:
+            query, params = _Q_TECH, (tech_id,)
+        elif only_with_clex:
+            query, params = _Q_ALL_CLEX, ()
+        else:
+            query, params = _Q_ALL, ()
+        
+        self._query_epoch += 1
+        epoch = self._query_epoch
+        self._query_key = key
+        self._loading_rows = []
+        task = DbStreamTask(lambda: self._fetch_items(query, params))
+        task.signals.chunk.connect(lambda rows: self.on_items_chunk(epoch, rows))
+        task.signals.finished.connect(lambda _: self.on_items_loaded(epoch))
+        task.signals.error.connect(lambda message: self.on_items_error(epoch, message))
+        QThreadPool.globalInstance().start(task)
+    
+    def _fetch_items(self, query: str,
+                     params: Tuple[Any, ...]) -> Iterator[List[Tuple[int, str, int, int]]]:
+        """
+        Run an item query on the dialog's connection and stream the rows.
+        
+        Args:
+            query: SQL query text
+            params: Query parameters
             
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to load items: {e}")
+        Yields:
+            Chunks of up to ITEM_FETCH_SIZE rows of
+            (device_id, device_name, has_clex, tech_id)
+        """
+        with self._conn_lock:
+            cursor = self._conn.execute(query, params)
+            cursor.arraysize = ITEM_FETCH_SIZE
+            rows = cursor.fetchmany()
+            while rows:
+                yield rows
+                rows = cursor.fetchmany()
     
-    def select_all(self):
-        """Select all items in the table."""
-        for row in range(self.items_table.rowCount()):
-            checkbox = self.items_table.item(row, 0)
-            if checkbox:
-                checkbox.setCheckState(Qt.Checked)
+    def on_items_chunk(self, epoch: int, rows: List[Tuple[int, str, int, int]]):
+        """
+        Handle a chunk of items streamed by a refresh.
         
+        Args:
+            epoch: Query epoch the refresh was started with
+            rows: Rows of (device_id, device_name, has_clex, tech_id)
+        """
+        # Ignore results of a superseded refresh
+        if epoch != self._query_epoch:
+            return
+        
+        self._loading_rows.extend(rows)
+        
+        # The first chunk replaces the previous rows, later ones extend them
+        if self._rows_epoch != epoch:
+            self._rows_epoch = epoch
+            self.items_model.set_rows(rows, self._tech_names)
+        else:
+            self.items_model.append_rows(rows, self._tech_names)
+    
+    def on_items_loaded(self, epoch: int):
+        """
+        Handle the end of a refresh.
+        
+        Args:
+            epoch: Query epoch the refresh was started with
+        """
+        if epoch != self._query_epoch:
+            return
+        
+        # No chunk arrived, so the query matched nothing
+        if self._rows_epoch != epoch:
+            self._rows_epoch = epoch
+            self.items_model.set_rows([], self._tech_names)
+        
+        self._last_key = self._query_key
+        self._last_rows = self._loading_rows
+        
+        # Update selection label
         self.update_selection_count()
     
+    def on_items_error(self, epoch: int, error_message: str):
+        """
+        Handle a failed refresh.
+        
+        Args:
+            epoch: Query epoch the refresh was started with
+            error_message: Error message
+        """
+        if epoch != self._query_epoch:
+            return
+        QMessageBox.critical(self, "Database Error", f"Failed to load items: {error_message}")
+    
+    def select_all(self):
+        """Select all items shown in the table."""
+        if self.items_proxy.search_text():
+            self.items_model.set_rows_checked(self.items_proxy.visible_source_rows(), True)
+        else:
+            self.items_model.set_all_checked(True)
+    
     def select_none(self):
         """Deselect all items in the table."""
-        for row in range(self.items_table.rowCount()):
-            checkbox = self.items_table.item(row, 0)
-            if checkbox:
-                checkbox.setCheckState(Qt.Unchecked)
-        
-        self.update_selection_count()
+        self.items_model.set_all_checked(False)
     
     def invert_selection(self):
-        """Invert the current selection."""
-        for row in range(self.items_table.rowCount()):
-            checkbox = self.items_table.item(row, 0)
-            if checkbox:
-                new_state = Qt.Unchecked if checkbox.checkState() == Qt.Checked else Qt.Checked
-                checkbox.setCheckState(new_state)
-        
-        self.update_selection_count()
+        """Invert the selection of the items shown in the table."""
+        # Hidden rows are never checked, so only the shown rows need flipping
+        if self.items_proxy.search_text():
+            self.items_model.invert_rows_checked(self.items_proxy.visible_source_rows())
+        else:
+            self.items_model.invert_checked()
     
     def update_selection_count(self):
         """Update the selection count label."""
@@ -326,30 +746,16 @@ class BulkOperationsDialog(QDialog):
         Returns:
             Number of selected items
         """
-        count = 0
-        for row in range(self.items_table.rowCount()):
-            checkbox = self.items_table.item(row, 0)
-            if checkbox and checkbox.checkState() == Qt.Checked:
-                count += 1
-        return count
+        return self.items_model.checked_count()
     
-    def get_selected_items(self) -> List[Tuple[int, str, int, str]]:
+    def get_selected_items(self) -> Collection[Tuple[int, str, int, str]]:
         """
         Get information about all selected items.
         
         Returns:
-            List of tuples (device_id, device_name, tech_id, tech_name)
-        """
-        selected = []
-        for row in range(self.items_table.rowCount()):
-            checkbox = self.items_table.item(row, 0)
-            if checkbox and checkbox.checkState() == Qt.Checked:
-                device_item = self.items_table.item(row, 1)
-                device_id, tech_id = device_item.data(Qt.UserRole)
-                device_name = device_item.text()
-                tech_name = self.items_table.item(row, 2).text()
-                selected.append((device_id, device_name, tech_id, tech_name))
-        return selected
+            Collection of tuples (device_id, device_name, tech_id, tech_name)
+        """
+        return self.items_model.checked_items()
     
     def execute_operation(self):
         """Execute the selected operation on the selected items."""
@@ -370,7 +776,7 @@ class BulkOperationsDialog(QDialog):
         # Execute the operation
         handler(selected_items)
     
-    def handle_export_operation(self, selected_items: List[Tuple[int, str, int, str]]):
+    def handle_export_operation(self, selected_items: Collection[Tuple[int, str, int, str]]):
         """
         Handle the export operation.
         
@@ -385,7 +791,7 @@ class BulkOperationsDialog(QDialog):
         # Emit completion signal
         self.operationCompleted.emit("export", len(device_ids))
     
-    def handle_delete_operation(self, selected_items: List[Tuple[int, str, int, str]]):
+    def handle_delete_operation(self, selected_items: Collection[Tuple[int, str, int, str]]):
         """
         Handle the delete operation.
         
@@ -409,57 +815,105 @@ class BulkOperationsDialog(QDialog):
         self.progress_bar.setValue(0)
         self.progress_bar.setMaximum(len(selected_items))
         
-        # Disable controls during operation
+        # Disable controls during operation; the table and selection buttons
+        # too, since the selection is read in place while the chunks run
         self.execute_button.setEnabled(False)
         self.close_button.setEnabled(False)
+        self.items_table.setEnabled(False)
+        self.select_all_button.setEnabled(False)
+        self.select_none_button.setEnabled(False)
+        self.invert_selection_button.setEnabled(False)
         
         # Execute deletion
         success_count = 0
         error_count = 0
         
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            for i, (device_id, device_name, tech_id, tech_name) in enumerate(selected_items):
-                try:
-                    # Delete the CLEX definition
-                    cursor.execute("DELETE FROM clex_definitions WHERE device_id = ?", (device_id,))
-                    
-                    # Update the device to indicate it no longer has a CLEX definition
-                    cursor.execute("UPDATE devices SET has_clex_definition = 0 WHERE id = ?", (device_id,))
+        with self._conn_lock:
+            try:
+                cursor = self._conn.cursor()
+                
+                # One transaction for the whole batch, one IN (...) statement per table per chunk
+                cursor.execute("BEGIN IMMEDIATE")
+                # Ids are pulled lazily from the selection, one chunk at a time
+                device_ids = (device_id for device_id, _, _, _ in selected_items)
+                done = 0
+                # Repaint the progress bar at most once per percent
+                report_every = max(1, len(selected_items) // 100)
+                reported = 0
+                while True:
+                    ids = list(islice(device_ids, DELETE_CHUNK_SIZE))
+                    if not ids:
+                        break
+                    placeholders = ",".join("?" * len(ids))
+                    # A failing chunk rolls back to its savepoint only
+                    cursor.execute("SAVEPOINT chunk")
+                    try:
+                        # Delete the CLEX definitions
+                        cursor.execute(SQL_DELETE_CLEX.format(placeholders), ids)
+                        deleted = cursor.rowcount
+                        cursor.execute("RELEASE SAVEPOINT chunk")
+                        success_count += deleted
+                    except sqlite3.Error:
+                        cursor.execute("ROLLBACK TO SAVEPOINT chunk")
+                        cursor.execute("RELEASE SAVEPOINT chunk")
+                        
+                        # Retry the chunk one id at a time to isolate the failures
+                        for device_id in ids:
+                            cursor.execute("SAVEPOINT item")
+                            try:
+                                cursor.execute(SQL_DELETE_CLEX.format("?"), (device_id,))
+                                deleted = cursor.rowcount
+                            except sqlite3.Error:
+                                cursor.execute("ROLLBACK TO SAVEPOINT item")
+                                error_count += 1
+                            else:
+                                success_count += deleted
+                            cursor.execute("RELEASE SAVEPOINT item")
                     
-                    success_count += 1
-                except sqlite3.Error:
-                    error_count += 1
+                    # Update progress
+                    done += len(ids)
+                    if done - reported >= report_every:
+                        reported = done
+                        self.progress_bar.setValue(done)
+                        # Paint the bar only; running the event loop here
+                        # could close the dialog or start a refresh while
+                        # the transaction holds the connection
+                        self.progress_bar.repaint()
                 
-                # Update progress
-                self.progress_bar.setValue(i + 1)
-            
-            # Commit changes
-            conn.commit()
-            conn.close()
-            
-            # Show results
-            QMessageBox.information(
-                self, "Deletion Complete",
-                f"Successfully deleted {success_count} CLEX definitions.\n"
-                f"Failed to delete {error_count} CLEX definitions."
-            )
-            
-            # Emit completion signal
-            self.operationCompleted.emit("delete", success_count)
-            
-            # Refresh items
-            self.refresh_items()
-            
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to delete CLEX definitions: {e}")
-        
-        finally:
-            # Hide progress bar
-            self.progress_bar.setVisible(False)
+                self.progress_bar.setValue(done)
+                
+                # Commit changes
+                cursor.execute("COMMIT")
+                
+                # Show results
+                QMessageBox.information(
+                    self, "Deletion Complete",
+                    f"Successfully deleted {success_count} CLEX definitions.\n"
+                    f"Failed to delete {error_count} CLEX definitions."
+                )
+                
+                # Emit completion signal
+                self.operationCompleted.emit("delete", success_count)
+                
+                # Cached rows no longer match the database
+                self._last_key = None
+                
+                # Refresh items
+                self.refresh_items()
+                
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                QMessageBox.critical(self, "Database Error", f"Failed to delete CLEX definitions: {e}")
             
-            # Re-enable controls
-            self.execute_button.setEnabled(True)
-            self.close_button.setEnabled(True)
\ No newline at end of file
+            finally:
+                # Hide progress bar
+                self.progress_bar.setVisible(False)
+                
+                # Re-enable controls
+                self.execute_button.setEnabled(True)
+                self.close_button.setEnabled(True)
+                self.items_table.setEnabled(True)
+                self.select_all_button.setEnabled(True)
+                self.select_none_button.setEnabled(True)
+                self.invert_selection_button.setEnabled(True)
\ No newline at end of file
@@ -1,14 +1,34 @@
 # dialogs/compare_dialog.py
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, 
-                            QGroupBox, QComboBox, QTextEdit, QPushButton, QMessageBox)
-from PyQt5.QtCore import Qt
+                            QListWidgetItem, QGroupBox, QComboBox, QPlainTextEdit, QPushButton, QMessageBox)
+from PyQt5.QtCore import Qt, QThreadPool
 from PyQt5.QtGui import QFont
+import re
 import sqlite3
-from typing import Optional, List, Tuple, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Tuple, Dict, Any
 
+from database_manager import SQL_CREATE_CLEX_DEVICE_INDEX, SQL_CREATE_DEVICE_TECH_CLEX_NAME_INDEX
 # We'll import the SyntaxHighlighter class later when we move it to its own module
 # For now, we'll assume it's available from a ui_components module
 from ui_components.syntax_highlighter import SyntaxHighlighter
+from workers import DbTask
+
+# Whole "Folder Path:"/"File Name:" lines of a definition, which the header
+# already shows
+_FILTER_RE = re.compile(r'^[^\S\n]*(?:Folder Path:|File Name:)[^\n]*(?:\n|\Z)', re.MULTILINE)
+
+# Queries kept as constants so the connection's statement cache reuses them
+SQL_TECHNOLOGIES = "SELECT id, name, version FROM technologies ORDER BY name"
+SQL_CLEX_DEVICES = (
+    "SELECT technology_id, id, name FROM devices "
+    "WHERE has_clex_definition = 1 ORDER BY technology_id, name"
+)
+SQL_CLEX_DEFINITIONS = (
+    "SELECT device_id, folder_path, file_name, definition_text "
+    "FROM clex_definitions WHERE device_id IN (?, ?)"
+)
 
 class CompareDialog(QDialog):
     """
@@ -18,6 +38,12 @@ class CompareDialog(QDialog):
     technologies and compare their CLEX definitions side by side.
     """
     
+    # Definitions longer than this many characters are shown unhighlighted;
+    # QSyntaxHighlighter becomes unresponsive on very large documents
+    SIZE_LIMIT = 500_000
+    # Number of definitions kept in memory for repeated comparisons
+    DEFINITION_CACHE_SIZE = 128
+    
     def __init__(self, parent=None, db_file=None):
         """
         Initialize the compare dialog.
@@ -29,6 +55,28 @@ class CompareDialog(QDialog):
         super().__init__(parent)
         self.db_file = db_file
         self.parent = parent
+        
+        # One connection for the lifetime of the dialog, shared with the
+        # definition loads running on the thread pool; the lock serializes its use
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn_lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self.ensure_indexes()
+        
+        # Devices with a CLEX definition per technology id, as (id, name)
+        # tuples in name order; filled once by load_technologies
+        self._devices_by_tech: Dict[int, List[Tuple[int, str]]] = {}
+        # Definitions already shown, by device id and in least recently used
+        # order; guarded by _conn_lock
+        self._definition_cache: "OrderedDict[int, Optional[Tuple[str, str, str]]]" = OrderedDict()
+        # Device id most recently requested for each text pane
+        self._requested_devices: Dict[QPlainTextEdit, int] = {}
+        # Device id whose definition each text pane currently shows
+        self._loaded_devices: Dict[QPlainTextEdit, int] = {}
+        
         self.setWindowTitle("Compare CLEX Definitions")
         self.resize(900, 600)
         
@@ -48,6 +96,24 @@ class CompareDialog(QDialog):
         # Load initial data
         self.load_technologies()
     
+    def ensure_indexes(self):
+        """Create the indexes used by the dialog's queries if they do not exist."""
+        self._conn.execute(SQL_CREATE_DEVICE_TECH_CLEX_NAME_INDEX)
+        self._conn.execute(SQL_CREATE_CLEX_DEVICE_INDEX)
+    
+    def done(self, result: int):
+        """
+        Close the dialog and its database connection.
+        
+        Args:
+            result: Dialog result code
+        """
+        # Drop the results of any definition load still running
+        self._requested_devices.clear()
+        with self._conn_lock:
+            self._conn.close()
+        super().done(result)
+    
     def setup_ui(self):
         """Set up the dialog UI components."""
         layout = QVBoxLayout()
@@ -74,12 +140,12 @@ class CompareDialog(QDialog):
         result_layout = QHBoxLayout()
         
         # Left text display
-        self.left_text = QTextEdit()
+        self.left_text = QPlainTextEdit()
         self.left_text.setReadOnly(True)
         result_layout.addWidget(self.left_text)
         
         # Right text display
-        self.right_text = QTextEdit()
+        self.right_text = QPlainTextEdit()
         self.right_text.setReadOnly(True)
         result_layout.addWidget(self.right_text)
         
@@ -138,13 +204,18 @@ class CompareDialog(QDialog):
         return group
     
     def load_technologies(self):
-        """Load technologies into both combo boxes."""
+        """Load technologies into both combo boxes, along with their devices."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
+            cursor = self._conn.cursor()
+            cursor.execute(SQL_TECHNOLOGIES)
             technologies = cursor.fetchall()
-            conn.close()
+            
+            # Load every technology's device list in one query, before adding
+            # the first combo item triggers load_devices
+            cursor.execute(SQL_CLEX_DEVICES)
+            self._devices_by_tech = {}
+            for tech_id, device_id, device_name in cursor:
+                self._devices_by_tech.setdefault(tech_id, []).append((device_id, device_name))
             
             for tech_id, tech_name, tech_version in technologies:
                 display_text = f"{tech_name} v{tech_version}" if tech_version else tech_name
@@ -181,24 +252,18 @@ class CompareDialog(QDialog):
             tech_id: ID of the technology
             list_widget: List widget to populate
         """
+        # Repaint once after the whole list is filled
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, name, has_clex_definition FROM devices "
-                "WHERE technology_id = ? AND has_clex_definition = 1 ORDER BY name", 
-                (tech_id,)
-            )
-            devices = cursor.fetchall()
-            conn.close()
-            
             list_widget.clear()
-            for device_id, device_name, has_clex in devices:
-                item = QListWidget.QListWidgetItem(device_name)
+            for device_id, device_name in self._devices_by_tech.get(tech_id, ()):
+                item = QListWidgetItem(device_name)
                 item.setData(Qt.UserRole, device_id)
                 list_widget.addItem(item)
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to load devices: {e}")
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
     
     def compare_devices(self):
         """Compare the CLEX definitions of the selected devices."""
@@ -211,47 +276,152 @@ class CompareDialog(QDialog):
         
         left_id = left_item.data(Qt.UserRole)
         right_id = right_item.data(Qt.UserRole)
-        left_name = left_item.text()
-        right_name = right_item.text()
+        requests = [
+            (left_id, left_item.text(), self.left_text, self.left_highlighter),
+            (right_id, right_item.text(), self.right_text, self.right_highlighter),
+        ]
+        
+        # Only reload the panes whose selection changed
+        pending = []
+        for request in requests:
+            device_id, _, text_edit, _ = request
+            if self._loaded_devices.get(text_edit) == device_id:
+                # Already shown; drop any load of another device still running
+                self._requested_devices[text_edit] = device_id
+            elif self._requested_devices.get(text_edit) != device_id:
+                self._requested_devices[text_edit] = device_id
+                pending.append(request)
+        if not pending:
+            return
+        
+        # The pending definitions come from one query on the global thread
+        # pool; a single pending pane passes its device id for both sides
+        first_id, last_id = pending[0][0], pending[-1][0]
+        task = DbTask(lambda: self._load_two_definitions(first_id, last_id))
+        task.signals.finished.connect(
+            lambda results: self.on_definitions_loaded(pending, results))
+        task.signals.error.connect(
+            lambda message: self.on_definitions_error(pending, message))
+        QThreadPool.globalInstance().start(task)
+    
+    def _fetch_definitions(self, left_id: int, right_id: int) -> Dict[int, Optional[Tuple[str, str, str]]]:
+        """
+        Fetch two devices' CLEX definitions, querying only those not cached.
+        
+        Args:
+            left_id: ID of the first device
+            right_id: ID of the second device
+            
+        Returns:
+            Dictionary mapping each device ID to a tuple of
+            (folder_path, file_name, definition_text), or None
+        """
+        with self._conn_lock:
+            cache = self._definition_cache
+            missing = [device_id for device_id in {left_id, right_id} if device_id not in cache]
+            if missing:
+                rows: Dict[int, Tuple[str, str, str]] = {}
+                cursor = self._conn.execute(SQL_CLEX_DEFINITIONS, (missing[0], missing[-1]))
+                for device_id, folder_path, file_name, definition_text in cursor:
+                    # Keep the first definition of a device, as fetchone did
+                    rows.setdefault(device_id, (folder_path, file_name, definition_text))
+                for device_id in missing:
+                    cache[device_id] = rows.get(device_id)
+            
+            results = {}
+            for device_id in (left_id, right_id):
+                cache.move_to_end(device_id)
+                results[device_id] = cache[device_id]
+            while len(cache) > self.DEFINITION_CACHE_SIZE:
+                cache.popitem(last=False)
+            return results
+    
+    def _load_two_definitions(self, left_id: int, right_id: int) -> Dict[int, Optional[Tuple[str, str, str]]]:
+        """
+        Fetch two devices' CLEX definitions and filter them for display.
+        
+        Runs on a thread pool thread.
         
-        self.load_definition(left_id, left_name, self.left_text)
-        self.load_definition(right_id, right_name, self.right_text)
+        Args:
+            left_id: ID of the first device
+            right_id: ID of the second device
+            
+        Returns:
+            Dictionary mapping each device ID to a tuple of
+            (folder_path, file_name, filtered_definition), or None
+        """
+        results = {}
+        for device_id, row in self._fetch_definitions(left_id, right_id).items():
+            if not row:
+                results[device_id] = None
+                continue
+            
+            folder_path, file_name, definition_text = row
+            
+            # Filter out folder and file name lines from the definition
+            filtered_definition = _FILTER_RE.sub('', definition_text)
+            # A removed unterminated last line leaves its predecessor's newline
+            if filtered_definition.endswith('\n') and not definition_text.endswith('\n'):
+                filtered_definition = filtered_definition[:-1]
+            
+            results[device_id] = (folder_path, file_name, filtered_definition)
+        return results
     
-    def load_definition(self, device_id: int, device_name: str, text_edit: QTextEdit):
+    def on_definitions_loaded(self, requests: List[Tuple[int, str, QPlainTextEdit, SyntaxHighlighter]],
+                              results: Dict[int, Optional[Tuple[str, str, str]]]):
         """
-        Load the CLEX definition for a device into a text edit.
+        Show loaded CLEX definitions in their panes.
         
         Args:
-            device_id: ID of the device
+            requests: (device_id, device_name, text_edit, highlighter) per pane
+            results: Loaded definitions by device ID, as returned by
+                _load_two_definitions
+        """
+        for device_id, device_name, text_edit, highlighter in requests:
+            # Skip a pane whose load was superseded by a newer one
+            if self._requested_devices.get(text_edit) == device_id:
+                self._render_definition(results[device_id], device_name, text_edit, highlighter)
+                self._loaded_devices[text_edit] = device_id
+    
+    def _render_definition(self, row: Optional[Tuple[str, str, str]], device_name: str,
+                           text_edit: QPlainTextEdit, highlighter: SyntaxHighlighter):
+        """
+        Show a CLEX definition in a text edit.
+        
+        Args:
+            row: Tuple of (folder_path, file_name, filtered_definition), or None
             device_name: Name of the device
-            text_edit: QTextEdit to display the definition
+            text_edit: QPlainTextEdit to display the definition
+            highlighter: Syntax highlighter for text_edit
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT folder_path, file_name, definition_text FROM clex_definitions WHERE device_id = ?", 
-                (device_id,)
-            )
-            result = cursor.fetchone()
-            conn.close()
+        if row:
+            folder_path, file_name, filtered_definition = row
+            header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
             
-            if result:
-                folder_path, file_name, definition_text = result
-                header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
-                
-                # Filter out folder and file name lines from the definition
-                definition_lines = definition_text.split('\n')
-                filtered_lines = [
-                    line for line in definition_lines 
-                    if not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
-                filtered_definition = '\n'.join(filtered_lines)
-                
-                text_edit.clear()
-                text_edit.setPlainText(header_text + filtered_definition)
-            else:
-                text_edit.clear()
-                text_edit.setPlainText(f"No CLEX definition found for '{device_name}'")
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Failed to load CLEX definition: {e}")
\ No newline at end of file
+            # Insert the text unhighlighted, then highlight it in one pass
+            # on reattaching; oversized definitions stay unhighlighted
+            highlighter.setDocument(None)
+            text_edit.setPlainText(header_text + filtered_definition)
+            if len(filtered_definition) <= self.SIZE_LIMIT:
+                highlighter.setDocument(text_edit.document())
+        else:
+            text_edit.setPlainText(f"No CLEX definition found for '{device_name}'")
+    
+    def on_definitions_error(self, requests: List[Tuple[int, str, QPlainTextEdit, SyntaxHighlighter]],
+                             error_message: str):
+        """
+        Handle a failed definition load.
+        
+        Args:
+            requests: (device_id, device_name, text_edit, highlighter) per pane
+            error_message: Error message
+        """
+        failed = False
+        for device_id, _, text_edit, _ in requests:
+            if self._requested_devices.get(text_edit) == device_id:
+                # Forget the request so comparing again retries the load
+                del self._requested_devices[text_edit]
+                failed = True
+        if not failed:
+            return
+        QMessageBox.critical(self, "Database Error", f"Failed to load CLEX definition: {error_message}")
@@ -1,8 +1,8 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                             QPushButton, QCheckBox, QFrame, QSpacerItem,
                             QSizePolicy, QDialogButtonBox, QApplication)
-from PyQt5.QtCore import Qt, QSettings, QSize
-from PyQt5.QtGui import QIcon, QPixmap, QFont, QColor, QPalette
+from PyQt5.QtCore import Qt, QSettings, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap, QFont
 from typing import Optional, Dict, List, Tuple, Callable
 
 class ConfirmationDialog(QDialog):
@@ -13,6 +13,9 @@ class ConfirmationDialog(QDialog):
     its consequences, with visual cues to indicate severity.
     """
     
+    # Signal emitted when a "show this dialog" preference is written
+    preferenceSaved = pyqtSignal(str, bool)  # dialog_id, show
+    
     # Dialog types with associated icons and colors
     DIALOG_TYPES = {
         'warning': {
@@ -37,6 +40,32 @@ class ConfirmationDialog(QDialog):
         }
     }
     
+    # 48x48 theme icon pixmaps per dialog type (None where the theme has no
+    # icon); built on first use, once a QApplication exists
+    _ICONS: Optional[Dict[str, Optional[QPixmap]]] = None
+    
+    @classmethod
+    def _icon_cache(cls) -> Dict[str, Optional[QPixmap]]:
+        """
+        Get the icon pixmaps for all dialog types, looking them up on first call.
+        
+        Returns:
+            Dictionary mapping dialog type to its pixmap, or None
+        """
+        if cls._ICONS is None:
+            cls._ICONS = {}
+            for dialog_type, type_info in cls.DIALOG_TYPES.items():
+                icon_name = type_info['icon']
+                if QIcon.hasThemeIcon(icon_name):
+                    cls._ICONS[dialog_type] = QIcon.fromTheme(icon_name).pixmap(QSize(48, 48))
+                else:
+                    cls._ICONS[dialog_type] = None
+        return cls._ICONS
+    
+    # Fonts shared by every dialog instance; built by the first setup_ui
+    _TITLE_FONT: Optional[QFont] = None
+    _CONSEQUENCES_FONT: Optional[QFont] = None
+    
     def __init__(self, parent=None, settings: Optional[QSettings] = None):
         """
         Initialize the confirmation dialog.
@@ -51,11 +80,20 @@ class ConfirmationDialog(QDialog):
         self.dialog_id = None
         self.dont_show_option = False
         
-        # Initialize UI
-        self.setup_ui()
+        # The widgets are built by the first set_content, so a dialog that is
+        # never shown costs no widget construction
+        self._ui_built = False
     
     def setup_ui(self):
         """Set up the dialog UI."""
+        cls = type(self)
+        if cls._TITLE_FONT is None:
+            cls._TITLE_FONT = QFont()
+            cls._TITLE_FONT.setBold(True)
+            cls._TITLE_FONT.setPointSize(cls._TITLE_FONT.pointSize() + 2)
+            cls._CONSEQUENCES_FONT = QFont()
+            cls._CONSEQUENCES_FONT.setBold(True)
+        
         # Configure dialog properties
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         self.setMinimumWidth(450)
@@ -78,10 +116,7 @@ class ConfirmationDialog(QDialog):
         
         # Title label
         self.title_label = QLabel()
-        title_font = self.title_label.font()
-        title_font.setBold(True)
-        title_font.setPointSize(title_font.pointSize() + 2)
-        self.title_label.setFont(title_font)
+        self.title_label.setFont(self._TITLE_FONT)
         message_layout.addWidget(self.title_label)
         
         # Message label
@@ -103,9 +138,7 @@ class ConfirmationDialog(QDialog):
         
         # Consequences label
         consequences_title = QLabel("Consequences:")
-        consequences_font = consequences_title.font()
-        consequences_font.setBold(True)
-        consequences_title.setFont(consequences_font)
+        consequences_title.setFont(self._CONSEQUENCES_FONT)
         consequences_layout.addWidget(consequences_title)
         
         # Consequences content
@@ -172,18 +205,22 @@ class ConfirmationDialog(QDialog):
             dialog_id: Unique identifier for remembering "don't show again" preference
             dont_show_option: Whether to show the "don't show again" checkbox
         """
+        if not self._ui_built:
+            self.setup_ui()
+            self._ui_built = True
+        
         self.dialog_id = dialog_id
         self.dont_show_option = dont_show_option
         
         # Set dialog title
-        type_info = self.DIALOG_TYPES.get(dialog_type, self.DIALOG_TYPES['question'])
+        if dialog_type not in self.DIALOG_TYPES:
+            dialog_type = 'question'
+        type_info = self.DIALOG_TYPES[dialog_type]
         self.setWindowTitle(f"{type_info['title']}: {title}")
         
         # Set icon
-        icon_name = type_info['icon']
-        if QIcon.hasThemeIcon(icon_name):
-            icon = QIcon.fromTheme(icon_name)
-            pixmap = icon.pixmap(QSize(48, 48))
+        pixmap = self._icon_cache()[dialog_type]
+        if pixmap is not None:
             self.icon_label.setPixmap(pixmap)
         
         # Set title and message
@@ -203,15 +240,19 @@ class ConfirmationDialog(QDialog):
         else:
             self.confirm_button.setStyleSheet("")
         
-        # Configure "don't show again" checkbox
+        # Configure "don't show again" checkbox; the dialog is reused across
+        # confirmations, so a tick left from a previous one must not carry over
+        self.dont_show_checkbox.setChecked(False)
         self.dont_show_checkbox.setVisible(dont_show_option and dialog_id is not None)
         
     def accept(self):
         """Handle dialog acceptance, saving "don't show again" preference if needed."""
         # Save "don't show again" preference if the checkbox is checked
-        if self.dont_show_option and self.dialog_id and self.dont_show_checkbox.isChecked():
+        if (self._ui_built and self.dont_show_option and self.dialog_id
+                and self.dont_show_checkbox.isChecked()):
             key = f"confirmations/show_{self.dialog_id}"
             self.settings.setValue(key, False)
+            self.preferenceSaved.emit(self.dialog_id, False)
         
         super().accept()
 
@@ -233,6 +274,8 @@ class ConfirmationService:
         """
         self.settings = settings or QSettings()
         self.dialog = None
+        # "Show this dialog" preferences already read from settings, by dialog id
+        self._show_cache: Dict[str, bool] = {}
     
     def confirm_action(self, parent, title: str, message: str, consequences: str,
                       dialog_type: str = 'question', confirm_text: str = "Confirm",
@@ -262,6 +305,7 @@ class ConfirmationService:
         # Create dialog if needed
         if not self.dialog:
             self.dialog = ConfirmationDialog(parent, self.settings)
+            self.dialog.preferenceSaved.connect(self._show_cache.__setitem__)
         
         # Set content
         self.dialog.set_content(
@@ -283,8 +327,11 @@ class ConfirmationService:
         Returns:
             True if the dialog should be shown, False otherwise
         """
-        key = f"confirmations/show_{dialog_id}"
-        return self.settings.value(key, True, type=bool)
+        show = self._show_cache.get(dialog_id)
+        if show is None:
+            key = f"confirmations/show_{dialog_id}"
+            show = self._show_cache[dialog_id] = self.settings.value(key, True, type=bool)
+        return show
     
     def confirm_delete(self, parent, item_type: str, item_name: str, 
                      consequences: str = None, dialog_id: str = None,
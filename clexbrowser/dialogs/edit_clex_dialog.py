@@ -2,9 +2,9 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QLineEdit, QTextEdit, QPushButton, QMessageBox)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
-import sqlite3
 from typing import Optional, Dict, Tuple
 
+from database_manager import SQL_DEVICE_WITH_CLEX, build_clex_update, get_shared_connection
 from ui_components.form_validation import (ValidatedLineEdit, FormFieldGroup, 
                                          FormValidator, required_validator)
 
@@ -31,8 +31,13 @@ class EditCLEXDialog(QDialog):
         self.db_manager = db_manager
         self.device_id = device_id
         self.parent = parent
+        # A parent window with a status bar shows the outcome itself once it
+        # has reloaded the definition
+        self._parent_has_status_bar = hasattr(parent, 'statusBar')
         self.form_validator = FormValidator()
         self.original_data = None
+        # Outcome of an accepted save, for the parent to show in its status bar
+        self.status_message = None
         
         self.setWindowTitle("Edit CLEX Definition")
         self.resize(700, 500)
@@ -47,12 +52,16 @@ class EditCLEXDialog(QDialog):
         form_layout = QVBoxLayout()
         form_layout.setSpacing(15)
         
+        # Bold labels set a font rather than a style sheet, which would
+        # go through Qt's style sheet parser and repolish the widget
+        bold_font = QFont("", -1, QFont.Bold)
+        
         # Device information (read-only)
         device_layout = QHBoxLayout()
         device_label = QLabel("Device:")
-        device_label.setFont(QFont("", -1, QFont.Bold))
+        device_label.setFont(bold_font)
         self.device_name_label = QLabel()
-        self.device_name_label.setStyleSheet("font-weight: bold;")
+        self.device_name_label.setFont(bold_font)
         device_layout.addWidget(device_label)
         device_layout.addWidget(self.device_name_label)
         device_layout.addStretch()
@@ -61,7 +70,7 @@ class EditCLEXDialog(QDialog):
         # Technology information (read-only)
         tech_layout = QHBoxLayout()
         tech_label = QLabel("Technology:")
-        tech_label.setFont(QFont("", -1, QFont.Bold))
+        tech_label.setFont(bold_font)
         self.tech_name_label = QLabel()
         tech_layout.addWidget(tech_label)
         tech_layout.addWidget(self.tech_name_label)
@@ -84,7 +93,7 @@ class EditCLEXDialog(QDialog):
         
         # CLEX definition
         def_label = QLabel("CLEX Definition:")
-        def_label.setFont(QFont("", -1, QFont.Bold))
+        def_label.setFont(bold_font)
         form_layout.addWidget(def_label)
         
         self.def_text = QTextEdit()
@@ -120,61 +129,21 @@ class EditCLEXDialog(QDialog):
         try:
             if self.db_manager:
                 # Use DatabaseManager if available
-                device_info = self.db_manager.get_device_info(self.device_id)
-                if not device_info:
-                    raise ValueError(f"Device with ID {self.device_id} not found")
-                
-                tech_id, device_name, has_clex = device_info
-                
-                # Get technology name
-                technologies = self.db_manager.get_technologies()
-                tech_name = None
-                for t_id, t_name, t_version in technologies:
-                    if t_id == tech_id:
-                        tech_name = t_name
-                        if t_version:
-                            tech_name += f" v{t_version}"
-                        break
-                
-                # Get CLEX definition
-                clex_data = self.db_manager.get_clex_definition(self.device_id)
-                if not clex_data:
-                    raise ValueError(f"No CLEX definition found for device {device_name}")
-                
-                folder_path, file_name, definition_text = clex_data
-                
+                device_info = self.db_manager.get_device_with_clex(self.device_id)
             else:
                 # Use direct SQL
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                
-                # Get device information
-                cursor.execute(
-                    "SELECT d.name, t.name, t.version "
-                    "FROM devices d JOIN technologies t ON d.technology_id = t.id "
-                    "WHERE d.id = ?",
-                    (self.device_id,)
-                )
-                device_info = cursor.fetchone()
-                if not device_info:
-                    raise ValueError(f"Device with ID {self.device_id} not found")
-                
-                device_name, tech_name, tech_version = device_info
-                if tech_version:
-                    tech_name += f" v{tech_version}"
-                
-                # Get CLEX definition
-                cursor.execute(
-                    "SELECT folder_path, file_name, definition_text "
-                    "FROM clex_definitions WHERE device_id = ?",
-                    (self.device_id,)
-                )
-                result = cursor.fetchone()
-                if not result:
-                    raise ValueError(f"No CLEX definition found for device {device_name}")
-                
-                folder_path, file_name, definition_text = result
-                conn.close()
+                conn = get_shared_connection(self.db_file)
+                device_info = conn.execute(SQL_DEVICE_WITH_CLEX, (self.device_id,)).fetchone()
+            
+            if not device_info:
+                raise ValueError(f"Device with ID {self.device_id} not found")
+            
+            device_name, tech_name, tech_version, folder_path, file_name, definition_text = device_info
+            if tech_version:
+                tech_name += f" v{tech_version}"
+            
+            if definition_text is None:
+                raise ValueError(f"No CLEX definition found for device {device_name}")
             
             # Update UI with loaded data
             self.device_name_label.setText(device_name)
@@ -194,6 +163,23 @@ class EditCLEXDialog(QDialog):
             QMessageBox.critical(self, "Error", f"Failed to load CLEX definition: {e}")
             self.reject()
     
+    def report_success(self, title: str, message: str):
+        """
+        Report a successful save without blocking.
+        
+        When the parent window has a status bar the message is kept in
+        status_message for it to show after its reload; otherwise an
+        information box is shown.
+        
+        Args:
+            title: Title of the fallback message box
+            message: Message to show
+        """
+        if self._parent_has_status_bar:
+            self.status_message = message
+        else:
+            QMessageBox.information(self, title, message)
+    
     def save_definition(self):
         """Save the modified CLEX definition."""
         # Validate form
@@ -211,7 +197,7 @@ class EditCLEXDialog(QDialog):
         if (self.original_data["folder_path"] == folder_path and 
             self.original_data["file_name"] == file_name and 
             self.original_data["definition_text"] == definition_text):
-            QMessageBox.information(self, "No Changes", "No changes were made to the CLEX definition.")
+            self.report_success("No Changes", "No changes were made to the CLEX definition.")
             self.accept()
             return
         
@@ -220,31 +206,27 @@ class EditCLEXDialog(QDialog):
             QMessageBox.warning(self, "Missing Definition", "CLEX definition cannot be empty.")
             return
         
+        # Only the changed columns are written
+        changes = {
+            name: value if self.original_data[name] != value else None
+            for name, value in (("folder_path", folder_path), ("file_name", file_name),
+                                ("definition_text", definition_text))
+        }
+        
         try:
             # Update the CLEX definition
             if self.db_manager:
-                success = self.db_manager.update_clex_definition(
-                    self.device_id, folder_path, file_name, definition_text
-                )
+                success = self.db_manager.update_clex_definition(self.device_id, **changes)
             else:
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE clex_definitions SET folder_path = ?, file_name = ?, definition_text = ? "
-                    "WHERE device_id = ?",
-                    (folder_path, file_name, definition_text, self.device_id)
+                # The shared connection autocommits the single UPDATE
+                cursor = get_shared_connection(self.db_file).execute(
+                    *build_clex_update(self.device_id, **changes)
                 )
-                conn.commit()
                 success = cursor.rowcount > 0
-                conn.close()
             
             if success:
-                QMessageBox.information(self, "Success", "CLEX definition updated successfully.")
-                
-                # Notify parent to update display
-                if hasattr(self.parent, 'load_clex_definition'):
-                    self.parent.load_clex_definition(self.device_id, self.device_name_label.text())
-                
+                # The parent reloads the definition once the dialog is accepted
+                self.report_success("Success", "CLEX definition updated successfully.")
                 self.accept()
             else:
                 QMessageBox.warning(self, "Update Failed", "Failed to update CLEX definition.")
@@ -1,11 +1,109 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, 
-                            QRadioButton, QPushButton, QFileDialog, QMessageBox)
-from PyQt5.QtCore import Qt
-import sqlite3
-import os
+                            QRadioButton, QPushButton, QFileDialog, QMessageBox,
+                            QProgressBar)
+from PyQt5.QtCore import QThreadPool
 from datetime import datetime
 import re
-from typing import List, Optional, Dict, Tuple, Set
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+
+from database_manager import open_task_connection
+from workers import DbTask
+
+# Whole "Folder Path:"/"File Name:" lines of a definition, which the export
+# header already shows
+_FILTER_RE = re.compile(r'^[^\S\n]*(?:Folder Path:|File Name:)[^\n]*(?:\n|\Z)', re.MULTILINE)
+
+# Lines of a definition containing "assert", other than the lines above
+_ASSERT_LINE_RE = re.compile(
+    r'^(?![^\S\n]*(?:Folder Path:|File Name:))[^\n]*assert[^\n]*', re.MULTILINE
+)
+
+# Buffer size for export files; each row is written with a single call
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Format of the generation time in text and HTML exports
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Rule between devices in text exports
+TXT_SEPARATOR = '=' * 80
+
+# Escapes for text placed in HTML element content, applied in one pass;
+# the same as html.escape(quote=False) without importing html.entities
+_HTML_TBL = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# Every token the HTML export highlights, in one pattern so a definition is
+# highlighted in a single pass; comment lines and messages are matched first
+# and are not highlighted inside
+_TOK_RE = re.compile(
+    r'(?P<cmt>^[^\S\n]*//[^\n]*)'
+    r'|message="(?P<msg>[^"]*)"'
+    r'|(?P<kw>\b(?:inline|subckt|assert|expr|min|max|level|duration|sub|anal_types)\b)'
+    r'|(?P<as>\b(?:clexvw|clexcw|clex_)\w*)',
+    re.MULTILINE
+)
+
+# Span class for each _TOK_RE group other than msg
+_TOKEN_CLASSES = {'cmt': 'comment', 'kw': 'keyword', 'as': 'assertion'}
+
+# First "inline subckt" line of a definition and the terminal list in it
+_INLINE_SUBCKT_RE = re.compile(r'^[^\S\n]*inline subckt[^\n]*', re.MULTILINE)
+_TERMINALS_RE = re.compile(r'\((.*?)\)')
+
+# Definitions seldom change between exports, so terminals are cached per text
+TERMINALS_CACHE_SIZE = 4096
+
+def _highlight_token(match: re.Match) -> str:
+    """
+    Wrap a token matched by _TOK_RE in its highlighting span.
+    
+    Args:
+        match: Match of _TOK_RE
+        
+    Returns:
+        HTML for the token
+    """
+    kind = match.lastgroup
+    if kind == 'msg':
+        return f'message="<span class="message">{match.group(kind)}</span>"'
+    return f'<span class="{_TOKEN_CLASSES[kind]}">{match.group(kind)}</span>'
+
+@lru_cache(maxsize=TERMINALS_CACHE_SIZE)
+def _extract_terminals(definition_text: str) -> str:
+    """
+    Extract the terminal list from a definition's inline subckt line.
+    
+    Args:
+        definition_text: CLEX definition text
+        
+    Returns:
+        Text between the first pair of parentheses on the inline subckt
+        line, or an empty string if there is none
+    """
+    inline_match = _INLINE_SUBCKT_RE.search(definition_text)
+    if inline_match:
+        match = _TERMINALS_RE.search(inline_match.group())
+        if match:
+            return match.group(1)
+    return ""
+
+
+def _filter_definition(definition_text: str) -> str:
+    """
+    Remove the folder and file name lines from a definition.
+    
+    Args:
+        definition_text: Definition text as stored in the database
+        
+    Returns:
+        Definition text without its "Folder Path:"/"File Name:" lines
+    """
+    filtered = _FILTER_RE.sub('', definition_text)
+    # A removed unterminated last line leaves its predecessor's newline
+    if filtered.endswith('\n') and not definition_text.endswith('\n'):
+        filtered = filtered[:-1]
+    return filtered
 
 class ExportDialog(QDialog):
     """
@@ -88,6 +186,12 @@ class ExportDialog(QDialog):
         format_group.setLayout(format_layout)
         layout.addWidget(format_group)
         
+        # Busy indicator shown while an export runs
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
         # Button layout
         button_layout = QHBoxLayout()
         
@@ -163,8 +267,51 @@ class ExportDialog(QDialog):
         if not file_name:
             return
         
+        # Query and write on the global thread pool so the dialog stays
+        # responsive during large exports
+        self.set_exporting(True)
+        preselected_devices = list(self.preselected_devices)
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        task = DbTask(lambda: self.run_export(export_type, export_format, file_name,
+                                              preselected_devices, timestamp))
+        task.signals.finished.connect(
+            lambda row_count: self.on_export_finished(file_name, row_count))
+        task.signals.error.connect(self.on_export_error)
+        QThreadPool.globalInstance().start(task)
+    
+    def set_exporting(self, exporting: bool):
+        """
+        Show or hide the busy indicator and lock the buttons during an export.
+        
+        Args:
+            exporting: Whether an export is running
+        """
+        self.progress_bar.setVisible(exporting)
+        self.export_button.setEnabled(not exporting)
+        self.cancel_button.setEnabled(not exporting)
+    
+    def run_export(self, export_type: str, export_format: str, file_name: str,
+                   preselected_devices: List[int], timestamp: str) -> Optional[int]:
+        """
+        Query the definitions to export and write them to a file.
+        
+        Runs on a thread pool thread.
+        
+        Args:
+            export_type: One of "current", "technology", "selected" or "all"
+            export_format: One of "txt", "html" or "csv"
+            file_name: Path to the output file
+            preselected_devices: Device IDs for the "selected" export type
+            timestamp: Generation time written into text and HTML exports
+            
+        Returns:
+            Number of definitions exported, or None if there were none (no
+            file is written then)
+        """
+        # A private connection: the shared one is not safe to use from a pool
+        # thread while GUI dialogs write through it
+        conn = open_task_connection(self.db_file)
         try:
-            conn = sqlite3.connect(self.db_file)
             cursor = conn.cursor()
             
             # Fetch data based on export type
@@ -187,14 +334,14 @@ class ExportDialog(QDialog):
                     (self.current_tech_id,)
                 )
             elif export_type == "selected":
-                placeholders = ",".join(["?"] * len(self.preselected_devices))
+                placeholders = ",".join(["?"] * len(preselected_devices))
                 cursor.execute(
                     f"SELECT d.name, t.name, c.folder_path, c.file_name, c.definition_text "
                     f"FROM clex_definitions c "
                     f"JOIN devices d ON c.device_id = d.id "
                     f"JOIN technologies t ON d.technology_id = t.id "
                     f"WHERE d.id IN ({placeholders}) ORDER BY t.name, d.name", 
-                    self.preselected_devices
+                    preselected_devices
                 )
             else:
                 cursor.execute(
@@ -205,64 +352,120 @@ class ExportDialog(QDialog):
                     "ORDER BY t.name, d.name"
                 )
             
-            rows = cursor.fetchall()
-            conn.close()
-            
-            if not rows:
-                QMessageBox.warning(self, "No Data", "No CLEX definitions found to export.")
-                return
+            # Rows are written as the cursor produces them, so only one
+            # definition is held in memory at a time
+            first_row = cursor.fetchone()
+            if first_row is None:
+                return None
+            rows = chain((first_row,), cursor)
             
             # Export based on format
             if export_format == "txt":
-                self.export_to_txt(file_name, rows)
+                return self.export_to_txt(file_name, rows, timestamp)
             elif export_format == "html":
-                self.export_to_html(file_name, rows)
+                return self.export_to_html(file_name, rows, timestamp)
             else:
-                self.export_to_csv(file_name, rows)
-            
-            QMessageBox.information(
-                self, "Export Complete", 
-                f"Successfully exported {len(rows)} CLEX definitions to {file_name}"
-            )
-            self.accept()
-        
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to export data: {e}")
+                return self.export_to_csv(file_name, rows)
+        finally:
+            # Also releases the statement if writing stopped early
+            conn.close()
+    
+    def on_export_finished(self, file_name: str, row_count: Optional[int]):
+        """
+        Report a completed export.
+        
+        Args:
+            file_name: Path to the output file
+            row_count: Number of definitions exported, or None if there were none
+        """
+        self.set_exporting(False)
+        
+        if row_count is None:
+            QMessageBox.warning(self, "No Data", "No CLEX definitions found to export.")
+            return
+        
+        self.report_success("Export Complete",
+                            f"Exported {row_count} CLEX definitions to {file_name}")
+        self.accept()
+    
+    def report_success(self, title: str, message: str):
+        """
+        Show a success message without blocking.
+        
+        The message goes to the parent window's status bar when it has one;
+        otherwise an information box is shown.
+        
+        Args:
+            title: Title of the fallback message box
+            message: Message to show
+        """
+        parent = self.parent()
+        if hasattr(parent, 'statusBar'):
+            parent.statusBar().showMessage(message, 5000)
+        else:
+            QMessageBox.information(self, title, message)
+    
+    def on_export_error(self, error_message: str):
+        """
+        Report a failed export.
+        
+        Args:
+            error_message: Error message
+        """
+        self.set_exporting(False)
+        QMessageBox.critical(self, "Export Error", f"Failed to export data: {error_message}")
     
-    def export_to_txt(self, file_name: str, rows: List[Tuple]):
+    def export_to_txt(self, file_name: str, rows: Iterable[Tuple],
+                      timestamp: Optional[str] = None) -> int:
         """
         Export data to a text file.
         
         Args:
             file_name: Path to the output file
-            rows: Data rows to export
+            rows: Data rows to export, consumed once
+            timestamp: Generation time to write; defaults to now
+            
+        Returns:
+            Number of rows exported
         """
-        with open(file_name, 'w') as f:
-            f.write(f"CLEX Definitions Export\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        if timestamp is None:
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        
+        with open(file_name, 'w', buffering=EXPORT_BUFFER_SIZE) as f:
+            f.write(f"CLEX Definitions Export\nGenerated: {timestamp}\n\n")
             
+            row_count = 0
             for device_name, tech_name, folder_path, file_name_val, definition_text in rows:
-                f.write(f"{'='*80}\n")
-                f.write(f"Device: {device_name}\n")
-                f.write(f"Technology: {tech_name}\n")
-                f.write(f"Folder: {folder_path}\n")
-                f.write(f"File: {file_name_val}\n\n")
-                
+                row_count += 1
                 # Filter out folder and file lines that may be in the definition text
-                filtered_lines = [
-                    line for line in definition_text.split('\n') 
-                    if not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
-                f.write('\n'.join(filtered_lines) + "\n\n")
+                f.write(
+                    f"{TXT_SEPARATOR}\n"
+                    f"Device: {device_name}\n"
+                    f"Technology: {tech_name}\n"
+                    f"Folder: {folder_path}\n"
+                    f"File: {file_name_val}\n\n"
+                    f"{_filter_definition(definition_text)}\n\n"
+                )
+        
+        return row_count
     
-    def export_to_html(self, file_name: str, rows: List[Tuple]):
+    def export_to_html(self, file_name: str, rows: Iterable[Tuple],
+                       timestamp: Optional[str] = None) -> int:
         """
         Export data to an HTML file with syntax highlighting.
         
         Args:
             file_name: Path to the output file
-            rows: Data rows to export
+            rows: Data rows to export, consumed once
+            timestamp: Generation time to write; defaults to now
+            
+        Returns:
+            Number of rows exported
         """
-        with open(file_name, 'w') as f:
+        if timestamp is None:
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        
+        with open(file_name, 'w', buffering=EXPORT_BUFFER_SIZE) as f:
             # Write HTML header
             f.write(f"""<!DOCTYPE html>
 <html>
@@ -283,118 +486,78 @@ class ExportDialog(QDialog):
 </head>
 <body>
     <h1>CLEX Definitions Export</h1>
-    <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <p>Generated: {timestamp}</p>
 """)
             
             # Write device definitions
+            row_count = 0
             for device_name, tech_name, folder_path, file_name_val, definition_text in rows:
-                f.write(f"""    <div class="device">
-        <div class="device-header">
-            <h2>{device_name}</h2>
-            <p><strong>Technology:</strong> {tech_name}</p>
-            <p><strong>Folder:</strong> {folder_path}</p>
-            <p><strong>File:</strong> {file_name_val}</p>
-        </div>
-        <div class="definition">
-""")
+                row_count += 1
                 # Filter and highlight the definition
-                filtered_lines = [
-                    line for line in definition_text.split('\n') 
-                    if not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
-                highlighted_def = '\n'.join(filtered_lines)
+                # Escaped before highlighting, which adds the only markup
+                highlighted_def = _filter_definition(definition_text).translate(_HTML_TBL)
                 
                 # Apply syntax highlighting
-                # Keywords
-                for keyword in ["inline", "subckt", "assert", "expr", "min", "max", "level", "duration", "sub", "anal_types"]:
-                    highlighted_def = re.sub(
-                        r'\b' + keyword + r'\b', 
-                        f'<span class="keyword">{keyword}</span>', 
-                        highlighted_def
-                    )
-                
-                # Assertions
-                for assertion in ["clexvw", "clexcw", "clex_"]:
-                    highlighted_def = re.sub(
-                        r'\b' + assertion + r'\w*', 
-                        lambda m: f'<span class="assertion">{m.group(0)}</span>', 
-                        highlighted_def
-                    )
+                highlighted_def = _TOK_RE.sub(_highlight_token, highlighted_def)
                 
-                # Messages
-                highlighted_def = re.sub(
-                    r'message="([^"]*)"', 
-                    r'message="<span class="message">\1</span>"', 
-                    highlighted_def
-                )
-                
-                # Comments
-                highlighted_def = re.sub(
-                    r'^(\s*\/\/.*)$', 
-                    r'<span class="comment">\1</span>', 
-                    highlighted_def, 
-                    flags=re.MULTILINE
-                )
-                
-                f.write(highlighted_def + "\n")
-                f.write(f"""        </div>
+                f.write(f"""    <div class="device">
+        <div class="device-header">
+            <h2>{device_name.translate(_HTML_TBL)}</h2>
+            <p><strong>Technology:</strong> {tech_name.translate(_HTML_TBL)}</p>
+            <p><strong>Folder:</strong> {folder_path.translate(_HTML_TBL)}</p>
+            <p><strong>File:</strong> {file_name_val.translate(_HTML_TBL)}</p>
+        </div>
+        <div class="definition">
+{highlighted_def}
+        </div>
     </div>
 """)
             
             # Write HTML footer
             f.write("</body>\n</html>")
+        
+        return row_count
     
-    def export_to_csv(self, file_name: str, rows: List[Tuple]):
+    def export_to_csv(self, file_name: str, rows: Iterable[Tuple]) -> int:
         """
         Export data to a CSV file.
         
         Args:
             file_name: Path to the output file
-            rows: Data rows to export
+            rows: Data rows to export, consumed once
+            
+        Returns:
+            Number of rows exported
         """
-        with open(file_name, 'w', newline='') as f:
+        with open(file_name, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as f:
             # Write header
             f.write("Technology\tFolder\tFile\tDevice\tTerminals\tCLEX Definition\n")
             
             # Write data rows
+            row_count = 0
             for device_name, tech_name, folder_path, file_name_val, definition_text in rows:
-                lines = definition_text.split('\n')
-                
+                row_count += 1
                 # Extract terminals from inline subckt
-                terminals = ""
-                for line in lines:
-                    if line.strip().startswith("inline subckt"):
-                        match = re.search(r'\((.*?)\)', line)
-                        if match:
-                            terminals = match.group(1)
-                        break
+                terminals = _extract_terminals(definition_text)
                 
-                # Extract CLEX assertions
-                clex_lines = [
-                    line.strip() for line in lines 
-                    if "assert" in line and not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
+                # Extract CLEX assertions; tabs become spaces in one pass over
+                # the definition rather than once per line
+                clex_lines = _ASSERT_LINE_RE.findall(definition_text.replace('\t', ' '))
+                
+                # The device columns are the same on every line of this device
+                prefix = "\t".join([
+                    tech_name.replace('\t', ' '),
+                    folder_path.replace('\t', ' '),
+                    file_name_val.replace('\t', ' '),
+                    device_name.replace('\t', ' '),
+                    terminals.replace('\t', ' '),
+                ]) + "\t"
                 
                 if not clex_lines:
                     # Write a row with no CLEX assertions
-                    escaped_fields = [
-                        tech_name.replace('\t', ' '),
-                        folder_path.replace('\t', ' '),
-                        file_name_val.replace('\t', ' '),
-                        device_name.replace('\t', ' '),
-                        terminals.replace('\t', ' '),
-                        ""
-                    ]
-                    f.write("\t".join(escaped_fields) + "\n")
+                    f.write(prefix + "\n")
                 else:
-                    # Write a row for each CLEX assertion
-                    for clex_line in clex_lines:
-                        escaped_fields = [
-                            tech_name.replace('\t', ' '),
-                            folder_path.replace('\t', ' '),
-                            file_name_val.replace('\t', ' '),
-                            device_name.replace('\t', ' '),
-                            terminals.replace('\t', ' '),
-                            clex_line.replace('\t', ' ')
-                        ]
-                        f.write("\t".join(escaped_fields) + "\n")
\ No newline at end of file
+                    # Write a row for each CLEX assertion, all in one call
+                    f.write("".join(prefix + clex_line.strip() + "\n" for clex_line in clex_lines))
+        
+        return row_count
\ No newline at end of file
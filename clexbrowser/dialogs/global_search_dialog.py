@@ -1,10 +1,211 @@
 # dialogs/global_search_dialog.py
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                            QPushButton, QCheckBox, QTableWidget, QTableWidgetItem,
-                            QAbstractItemView, QHeaderView, QMessageBox)
-from PyQt5.QtCore import Qt
-from typing import Optional, List, Tuple, Any, Union
+                            QPushButton, QCheckBox, QTableView,
+                            QAbstractItemView, QHeaderView, QMessageBox,
+                            QStyledItemDelegate, QStyleOptionViewItem, QStyle,
+                            QApplication)
+from PyQt5.QtCore import Qt, QThreadPool, QRect, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QPalette
+from typing import Optional, List, Tuple, Any, Iterator, Union
 import sqlite3
+import threading
+from array import array
+
+from database_manager import (ensure_search_indexes, iter_search_results,
+                              open_task_connection, parse_search_terms)
+from workers import DbStreamTask
+
+# Item data role holding the (start, length) of the search match in a cell
+MATCH_SPAN_ROLE = Qt.UserRole + 1
+
+class MatchHighlightDelegate(QStyledItemDelegate):
+    """
+    Item delegate that paints a highlight behind the matched part of a cell.
+    
+    The span comes from MATCH_SPAN_ROLE, so the item keeps its plain text and
+    no marked-up copy is built per row.
+    """
+    
+    HIGHLIGHT_COLOR = QColor(255, 215, 0, 120)
+    
+    def paint(self, painter, option, index):
+        """
+        Paint the cell, highlighting the match span if the item has one.
+        
+        Args:
+            painter: Painter to draw with
+            option: Style options for the cell
+            index: Model index of the cell
+        """
+        span = index.data(MATCH_SPAN_ROLE)
+        if not span:
+            super().paint(painter, option, index)
+            return
+        
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        
+        # Let the style draw the background and selection, then draw the text
+        text = opt.text
+        opt.text = ""
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+        
+        text_rect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, widget)
+        margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, widget) + 1
+        text_rect.adjust(margin, 0, -margin, 0)
+        metrics = opt.fontMetrics
+        start, length = span
+        
+        painter.save()
+        painter.setClipRect(text_rect)
+        left = text_rect.left() + metrics.horizontalAdvance(text[:start])
+        width = metrics.horizontalAdvance(text[start:start + length])
+        painter.fillRect(QRect(left, text_rect.top(), width, text_rect.height()),
+                         self.HIGHLIGHT_COLOR)
+        selected = opt.state & QStyle.State_Selected
+        painter.setPen(opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        painter.drawText(text_rect, int(opt.displayAlignment),
+                         metrics.elidedText(text, opt.textElideMode, text_rect.width()))
+        painter.restore()
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """
+    Table model for the global search results.
+    
+    Rows are stored as parallel arrays instead of one QTableWidgetItem per
+    cell, so showing results allocates no Qt objects and the view only asks
+    for the cells it paints.
+    """
+    
+    HEADERS = ["Device", "Technology", "Type", "Match"]
+    
+    def __init__(self, parent=None):
+        """
+        Initialize an empty model.
+        
+        Args:
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._ids = array('q')
+        self._names = []
+        self._techs = []
+        self._tech_ids = array('q')
+        self._types = []
+        self._contexts = []
+        self._search_text = ""
+        self._case_sensitive = False
+    
+    def set_rows(self, rows: List[Tuple], search_text: str, case_sensitive: bool):
+        """
+        Replace the model contents.
+        
+        Args:
+            rows: Tuples of (device_id, device_name, tech_name, tech_id,
+                match_type, context)
+            search_text: The search text, located in each context for highlighting
+            case_sensitive: Whether the search was case-sensitive
+        """
+        self.beginResetModel()
+        self._ids = array('q')
+        self._names = []
+        self._techs = []
+        self._tech_ids = array('q')
+        self._types = []
+        self._contexts = []
+        self._extend(rows)
+        self._search_text = search_text
+        self._case_sensitive = case_sensitive
+        self.endResetModel()
+    
+    def append_rows(self, rows: List[Tuple]):
+        """
+        Append rows of the same search to the end of the model.
+        
+        Args:
+            rows: Tuples of (device_id, device_name, tech_name, tech_id,
+                match_type, context)
+        """
+        if not rows:
+            return
+        start = len(self._ids)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._extend(rows)
+        self.endInsertRows()
+    
+    def _extend(self, rows: List[Tuple]):
+        """
+        Add rows to the end of the arrays.
+        
+        Args:
+            rows: Tuples of (device_id, device_name, tech_name, tech_id,
+                match_type, context)
+        """
+        if not rows:
+            return
+        # Transpose the batch in one pass instead of one generator per column
+        ids, names, techs, tech_ids, types, contexts = zip(*rows)
+        self._ids.extend(ids)
+        self._names.extend(names)
+        self._techs.extend(techs)
+        self._tech_ids.extend(tech_ids)
+        self._types.extend(types)
+        self._contexts.extend(contexts)
+    
+    def device_at(self, row: int) -> Tuple[int, int]:
+        """
+        Return the device of a row.
+        
+        Args:
+            row: Row number
+            
+        Returns:
+            Tuple of (device_id, tech_id)
+        """
+        return self._ids[row], self._tech_ids[row]
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Return the number of rows."""
+        return 0 if parent.isValid() else len(self._ids)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Return the data for a cell."""
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self._names[row]
+            if column == 1:
+                return self._techs[row]
+            if column == 2:
+                return self._types[row]
+            return self._contexts[row]
+        if role == MATCH_SPAN_ROLE and column == 3:
+            # Located when the cell is painted, so only visible rows pay for it
+            context = self._contexts[row]
+            highlight_start = (
+                context.find(self._search_text) if self._case_sensitive
+                else context.lower().find(self._search_text.lower())
+            )
+            if highlight_start >= 0:
+                return (highlight_start, len(self._search_text))
+        return None
+    
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole):
+        """Return the column headers."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
 
 class GlobalSearchDialog(QDialog):
     """
@@ -28,6 +229,17 @@ class GlobalSearchDialog(QDialog):
         self.db_file = db_file
         self.db_manager = db_manager
         self.parent = parent
+        # Parent window hooks, looked up once rather than on every use
+        self._select_device_by_id = getattr(parent, 'select_device_by_id', None)
+        self._status_bar = getattr(parent, 'status_bar', None)
+        # Incremented for every search started or stopped; a finished search
+        # whose epoch is no longer current is ignored
+        self._search_epoch = 0
+        # Set to make the running search stop early
+        self._cancel_event: Optional[threading.Event] = None
+        # Epoch of the search whose rows the table shows
+        self._rows_epoch = -1
+        self._search_text = ""
         
         self.setWindowTitle("Global Search")
         self.resize(800, 600)
@@ -46,6 +258,11 @@ class GlobalSearchDialog(QDialog):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Enter search term...")
+        self.search_input.setToolTip(
+            "Separate terms with spaces to find definitions containing all of them.\n"
+            "\"a phrase\" in double quotes is matched as a whole and -term excludes\n"
+            "definitions containing the term. Terms match anywhere in the text and\n"
+            "are matched literally; % _ * ? and [ are not wildcards.")
         self.search_input.returnPressed.connect(self.perform_search)
         search_layout.addWidget(self.search_input)
         
@@ -54,6 +271,12 @@ class GlobalSearchDialog(QDialog):
         self.search_button.clicked.connect(self.perform_search)
         search_layout.addWidget(self.search_button)
         
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setToolTip("Stop the running search")
+        self.stop_button.clicked.connect(self.stop_search)
+        self.stop_button.hide()  # Only shown while a search runs
+        search_layout.addWidget(self.stop_button)
+        
         layout.addLayout(search_layout)
         
         # Search options
@@ -63,6 +286,10 @@ class GlobalSearchDialog(QDialog):
         self.case_checkbox.setToolTip("Match exact case of search term")
         options_layout.addWidget(self.case_checkbox)
         
+        self.prefix_checkbox = QCheckBox("Prefix Match")
+        self.prefix_checkbox.setToolTip("Match device names that start with the search term")
+        options_layout.addWidget(self.prefix_checkbox)
+        
         self.devices_checkbox = QCheckBox("Device Names")
         self.devices_checkbox.setChecked(True)
         self.devices_checkbox.setToolTip("Search in device names")
@@ -79,14 +306,17 @@ class GlobalSearchDialog(QDialog):
         results_label = QLabel("Search Results:")
         layout.addWidget(results_label)
         
-        self.results_table = QTableWidget()
+        self.results_model = SearchResultsModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["Device", "Technology", "Type", "Match"])
         self.results_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
         self.results_table.doubleClicked.connect(self.on_result_double_clicked)
         self.results_table.setAlternatingRowColors(True)  # Improve readability
+        # Matches are highlighted when painted rather than marked up in the text
+        self.match_delegate = MatchHighlightDelegate(self.results_table)
+        self.results_table.setItemDelegateForColumn(3, self.match_delegate)
         layout.addWidget(self.results_table)
         
         # Button area
@@ -107,11 +337,11 @@ class GlobalSearchDialog(QDialog):
         self.setLayout(layout)
         
         # Connect selection changed to update button state
-        self.results_table.itemSelectionChanged.connect(self.update_button_state)
+        self.results_table.selectionModel().selectionChanged.connect(self.update_button_state)
     
     def update_button_state(self):
         """Enable or disable the view button based on selection."""
-        self.view_button.setEnabled(len(self.results_table.selectedItems()) > 0)
+        self.view_button.setEnabled(self.results_table.selectionModel().hasSelection())
     
     def perform_search(self):
         """Execute the search based on user inputs."""
@@ -122,6 +352,7 @@ class GlobalSearchDialog(QDialog):
             return
         
         case_sensitive = self.case_checkbox.isChecked()
+        prefix_match = self.prefix_checkbox.isChecked()
         search_devices = self.devices_checkbox.isChecked()
         search_defs = self.defs_checkbox.isChecked()
         
@@ -130,91 +361,166 @@ class GlobalSearchDialog(QDialog):
                               "Please select at least one search scope (Device Names or CLEX Definitions).")
             return
         
-        # Show a small loading indicator in the status bar
-        if hasattr(self, 'status_bar'):
-            self.status_bar.showMessage("Searching...")
+        # Search on the global thread pool so the dialog stays responsive;
+        # a search still running is superseded
+        self.stop_search()
+        epoch = self._search_epoch
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        self._search_text = search_text
+        self.set_searching(True)
+        
+        # Use database manager if available, otherwise use direct SQL;
+        # results are streamed in batches so the first rows show early
+        if self.db_manager:
+            db_manager = self.db_manager
+            task = DbStreamTask(lambda: db_manager.iter_search_devices_and_clex(
+                search_text, case_sensitive, search_devices, search_defs, prefix_match,
+                cancel_event))
+        else:
+            task = DbStreamTask(lambda: self._perform_search_sql(
+                search_text, case_sensitive, search_devices, search_defs, prefix_match,
+                cancel_event))
+        # Matches are highlighted at the first term of a multi-term search
+        highlight_text = parse_search_terms(search_text)[0][0]
+        task.signals.chunk.connect(
+            lambda rows: self.on_search_chunk(epoch, rows, highlight_text, case_sensitive))
+        task.signals.finished.connect(
+            lambda _: self.on_search_finished(epoch, search_text, case_sensitive))
+        task.signals.error.connect(lambda message: self.on_search_error(epoch, message))
+        QThreadPool.globalInstance().start(task)
+    
+    def stop_search(self):
+        """Stop the running search, if any, and drop its results."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+            # Rows already streamed stay in the table
+            if self._rows_epoch == self._search_epoch:
+                self.setWindowTitle(f"Global Search - Stopped after {self.results_model.rowCount()} "
+                                    f"matches for '{self._search_text}'")
+            self.set_searching(False)
+        self._search_epoch += 1
+    
+    def set_searching(self, searching: bool):
+        """
+        Show or hide the busy state while a search runs.
         
-        self.setCursor(Qt.BusyCursor)  # Show busy cursor
+        Args:
+            searching: Whether a search is running
+        """
+        self.search_button.setEnabled(not searching)
+        self.stop_button.setVisible(searching)
+        if searching:
+            self.setCursor(Qt.BusyCursor)  # Show busy cursor
+            # Show a small loading indicator in the status bar
+            if self._status_bar is not None:
+                self._status_bar.showMessage("Searching...")
+        else:
+            self.unsetCursor()  # Restore normal cursor
+            if self._status_bar is not None:
+                self._status_bar.clearMessage()
+    
+    def on_search_chunk(self, epoch: int, rows: List[Tuple], search_text: str,
+                        case_sensitive: bool):
+        """
+        Show a batch of results streamed by a running search.
         
-        try:
-            # Use database manager if available, otherwise use direct SQL
-            if self.db_manager:
-                results = self.db_manager.search_devices_and_clex(
-                    search_text, case_sensitive, search_devices, search_defs)
-            else:
-                results = self._perform_search_sql(
-                    search_text, case_sensitive, search_devices, search_defs)
-            
-            self.display_search_results(results, search_text, case_sensitive)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Search Error", f"Failed to perform search: {e}")
+        Args:
+            epoch: Search epoch the search was started with
+            rows: Search result tuples
+            search_text: Text to highlight in each match
+            case_sensitive: Whether the search was case-sensitive
+        """
+        # Ignore results of a stopped or superseded search
+        if epoch != self._search_epoch:
+            return
         
-        finally:
-            self.unsetCursor()  # Restore normal cursor
-            if hasattr(self, 'status_bar'):
-                self.status_bar.clearMessage()
+        # The first batch replaces the previous results, later ones extend them
+        if self._rows_epoch != epoch:
+            self._rows_epoch = epoch
+            self.display_search_results(rows, search_text, case_sensitive)
+        else:
+            self.results_model.append_rows(rows)
+        if self._status_bar is not None:
+            self._status_bar.showMessage(f"Searching... {self.results_model.rowCount()} matches")
+    
+    def on_search_finished(self, epoch: int, search_text: str, case_sensitive: bool):
+        """
+        Complete a search once all of its results have been streamed.
+        
+        Args:
+            epoch: Search epoch the search was started with
+            search_text: The original search text
+            case_sensitive: Whether the search was case-sensitive
+        """
+        if epoch != self._search_epoch:
+            return
+        self._cancel_event = None
+        self.set_searching(False)
+        
+        # No batch arrived, so the search matched nothing
+        if self._rows_epoch != epoch:
+            self._rows_epoch = epoch
+            self.display_search_results([], search_text, case_sensitive)
+        
+        status_message = f"Found {self.results_model.rowCount()} matches for '{search_text}'"
+        self.setWindowTitle(f"Global Search - {status_message}")
+    
+    def on_search_error(self, epoch: int, error_message: str):
+        """
+        Report a failed search.
+        
+        Args:
+            epoch: Search epoch the search was started with
+            error_message: Error message
+        """
+        if epoch != self._search_epoch:
+            return
+        self._cancel_event = None
+        self.set_searching(False)
+        QMessageBox.critical(self, "Search Error", f"Failed to perform search: {error_message}")
+    
+    def done(self, result: int):
+        """
+        Close the dialog, stopping any running search.
+        
+        Args:
+            result: Dialog result code
+        """
+        self.stop_search()
+        super().done(result)
     
     def _perform_search_sql(self, search_text: str, case_sensitive: bool, 
-                          search_devices: bool, search_defs: bool) -> List[Tuple]:
+                          search_devices: bool, search_defs: bool,
+                          prefix_match: bool = False,
+                          cancel_event: Optional[threading.Event] = None) -> Iterator[List[Tuple]]:
         """
-        Perform the search using direct SQL queries.
+        Perform the search on a private connection, streaming the results.
+        
+        Runs on a thread pool thread, so it reads through its own connection
+        rather than the shared one the GUI thread writes through.
         
         Args:
             search_text: Text to search for
             case_sensitive: Whether to use case-sensitive search
             search_devices: Whether to search device names
             search_defs: Whether to search CLEX definitions
+            prefix_match: Whether device names must start with the text
+            cancel_event: Optional event that stops the search early when set
             
-        Returns:
-            List of search results
+        Yields:
+            Non-empty lists of search results
         """
-        results = []
-        
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            if search_devices:
-                query = (
-                    "SELECT d.id, d.name, t.name, t.id FROM devices d "
-                    "JOIN technologies t ON d.technology_id = t.id WHERE " + 
-                    ("d.name LIKE ?" if case_sensitive else "LOWER(d.name) LIKE LOWER(?)") + 
-                    " ORDER BY t.name, d.name"
-                )
-                cursor.execute(query, (f"%{search_text}%",))
-                for device_id, device_name, tech_name, tech_id in cursor.fetchall():
-                    results.append((device_id, device_name, tech_name, tech_id, "Device Name", device_name))
-            
-            if search_defs:
-                query = (
-                    "SELECT d.id, d.name, t.name, t.id, c.definition_text FROM clex_definitions c "
-                    "JOIN devices d ON c.device_id = d.id "
-                    "JOIN technologies t ON d.technology_id = t.id WHERE " + 
-                    ("c.definition_text LIKE ?" if case_sensitive else "LOWER(c.definition_text) LIKE LOWER(?)") + 
-                    " ORDER BY t.name, d.name"
-                )
-                cursor.execute(query, (f"%{search_text}%",))
-                for device_id, device_name, tech_name, tech_id, definition_text in cursor.fetchall():
-                    match_pos = (
-                        definition_text.find(search_text) if case_sensitive 
-                        else definition_text.lower().find(search_text.lower())
-                    )
-                    if match_pos >= 0:
-                        start_line = (
-                            definition_text.rfind('\n', 0, match_pos) + 1 
-                            if definition_text.rfind('\n', 0, match_pos) >= 0 else 0
-                        )
-                        end_line = (
-                            definition_text.find('\n', match_pos) 
-                            if definition_text.find('\n', match_pos) >= 0 else len(definition_text)
-                        )
-                        context = definition_text[start_line:end_line]
-                        results.append((device_id, device_name, tech_name, tech_id, "CLEX Definition", context))
-            
-            conn.close()
-            return results
-            
+            conn = open_task_connection(self.db_file)
+            try:
+                has_fts = ensure_search_indexes(conn)
+                yield from iter_search_results(conn, search_text, case_sensitive,
+                                               search_devices, search_defs, prefix_match,
+                                               has_fts, cancel_event)
+            finally:
+                conn.close()
         except sqlite3.Error as e:
             raise Exception(f"Database error: {e}")
     
@@ -224,45 +530,13 @@ class GlobalSearchDialog(QDialog):
         
         Args:
             results: List of search result tuples
-            search_text: The original search text
+            search_text: Text to highlight in each match
             case_sensitive: Whether the search was case-sensitive
         """
-        self.results_table.setRowCount(len(results))
-        
-        for row, (device_id, device_name, tech_name, tech_id, match_type, context) in enumerate(results):
-            # Create and populate table items
-            device_item = QTableWidgetItem(device_name)
-            tech_item = QTableWidgetItem(tech_name)
-            type_item = QTableWidgetItem(match_type)
-            
-            # Highlight the search term in the context
-            highlight_start = (
-                context.find(search_text) if case_sensitive 
-                else context.lower().find(search_text.lower())
-            )
-            
-            if highlight_start >= 0:
-                # Create a version of the context with visual markers around the match
-                context_with_highlight = (
-                    f"{context[:highlight_start]}→{context[highlight_start:highlight_start+len(search_text)]}←"
-                    f"{context[highlight_start+len(search_text):]}"
-                )
-                context_item = QTableWidgetItem(context_with_highlight)
-            else:
-                context_item = QTableWidgetItem(context)
-            
-            # Store the device ID and technology ID as user data
-            device_item.setData(Qt.UserRole, (device_id, tech_id))
-            
-            # Add items to the table
-            self.results_table.setItem(row, 0, device_item)
-            self.results_table.setItem(row, 1, tech_item)
-            self.results_table.setItem(row, 2, type_item)
-            self.results_table.setItem(row, 3, context_item)
-        
-        # Update status message
-        status_message = f"Found {len(results)} matches for '{search_text}'"
-        self.setWindowTitle(f"Global Search - {status_message}")
+        # One model reset; cells are read from the tuples as they are painted
+        self.results_model.set_rows(results, search_text, case_sensitive)
+        # A reset clears the selection without emitting selectionChanged
+        self.update_button_state()
         
         # Select the first result if available
         if len(results) > 0:
@@ -280,17 +554,16 @@ class GlobalSearchDialog(QDialog):
             return
         
         row = selected_rows[0].row()
-        device_data = self.results_table.item(row, 0).data(Qt.UserRole)
         
-        if device_data and self.parent:
-            device_id, tech_id = device_data
+        if self.parent:
+            device_id, tech_id = self.results_model.device_at(row)
             self.accept()  # Close the dialog
             
             # Navigate to the selected device in the parent window
-            if hasattr(self.parent, 'select_device_by_id'):
-                if self.parent.select_device_by_id(device_id):
-                    if hasattr(self.parent, 'status_bar'):
-                        self.parent.status_bar.showMessage(f"Selected device from search results")
+            if self._select_device_by_id is not None:
+                if self._select_device_by_id(device_id):
+                    if self._status_bar is not None:
+                        self._status_bar.showMessage(f"Selected device from search results")
                 else:
                     QMessageBox.warning(
                         self.parent, 
@@ -3,11 +3,12 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QMessageBox, QGroupBox)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
-import sqlite3
 import re
+import sqlite3
 from datetime import datetime
 from typing import Tuple, Optional, Dict, List, Callable
 
+from database_manager import DuplicateDeviceError, get_shared_connection, is_duplicate_device_error
 from ui_components.form_validation import (ValidatedLineEdit, FormFieldGroup, 
                                          FormValidator, required_validator,
                                          min_length_validator, composite_validator)
@@ -33,7 +34,12 @@ class NewCLEXDialog(QDialog):
         self.db_file = db_file
         self.db_manager = db_manager
         self.parent = parent
+        # Parent window hook, looked up once rather than on every save
+        self._refresh_database = getattr(parent, 'refresh_database', None)
         self.form_validator = FormValidator()
+        # Existence of each (device name, technology id) looked up so far;
+        # names only get added when this dialog saves and closes
+        self._name_exists: Dict[Tuple[str, int], bool] = {}
         
         self.setWindowTitle("New CLEX Definition")
         self.resize(700, 500)
@@ -122,31 +128,46 @@ class NewCLEXDialog(QDialog):
         
         self.setLayout(layout)
         
-        # Connect validation change signals
-        self.device_input.textChanged.connect(self.validate_device_name)
+        # Check the name against the database once typing pauses rather
+        # than on every keystroke
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(250)
+        self._validate_timer.timeout.connect(self.validate_device_name)
+        self.device_input.textChanged.connect(lambda _text: self._validate_timer.start())
     
     def load_technologies(self):
         """Load technologies into the combo box."""
         try:
-            if self.db_manager:
-                technologies = self.db_manager.get_technologies()
-            else:
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
-                technologies = cursor.fetchall()
-                conn.close()
+            # The main window keeps the full list, reloaded with the database
+            technologies = getattr(self.parent, 'all_technologies', None)
+            if not technologies:
+                if self.db_manager:
+                    technologies = self.db_manager.get_technologies()
+                else:
+                    technologies = get_shared_connection(self.db_file).execute(
+                        "SELECT id, name, version FROM technologies ORDER BY name"
+                    ).fetchall()
             
-            for tech_id, tech_name, tech_version in technologies:
-                display_text = f"{tech_name} v{tech_version}" if tech_version else tech_name
-                self.tech_combo.addItem(display_text, tech_id)
+            # Fill the combo in one call, without a change signal per item
+            start = self.tech_combo.count()
+            self.tech_combo.blockSignals(True)
+            try:
+                self.tech_combo.addItems([
+                    f"{tech_name} v{tech_version}" if tech_version else tech_name
+                    for _, tech_name, tech_version in technologies
+                ])
+                for offset, (tech_id, _, _) in enumerate(technologies):
+                    self.tech_combo.setItemData(start + offset, tech_id)
+            finally:
+                self.tech_combo.blockSignals(False)
             
             # Select current technology if available
-            if hasattr(self.parent, 'current_tech_id') and self.parent.current_tech_id:
-                for i in range(self.tech_combo.count()):
-                    if self.tech_combo.itemData(i) == self.parent.current_tech_id:
-                        self.tech_combo.setCurrentIndex(i)
-                        break
+            current_tech_id = getattr(self.parent, 'current_tech_id', None)
+            if current_tech_id:
+                index = self.tech_combo.findData(current_tech_id)
+                if index >= 0:
+                    self.tech_combo.setCurrentIndex(index)
             
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to load technologies: {e}")
@@ -172,19 +193,21 @@ class NewCLEXDialog(QDialog):
             return
         
         try:
+            key = (device_name, tech_id)
+            if key in self._name_exists:
+                exists = self._name_exists[key]
             # Use DatabaseManager if available
-            if self.db_manager:
+            elif self.db_manager:
                 exists = self.db_manager.device_name_exists(device_name, tech_id)
             else:
-                # Otherwise use direct SQL
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute(
+                # Otherwise use direct SQL on the shared connection, which
+                # stays open between keystrokes
+                cursor = get_shared_connection(self.db_file).execute(
                     "SELECT id FROM devices WHERE name = ? AND technology_id = ?", 
                     (device_name, tech_id)
                 )
                 exists = cursor.fetchone() is not None
-                conn.close()
+            self._name_exists[key] = exists
             
             if exists:
                 self.device_input.set_validator(lambda text: (
@@ -230,6 +253,11 @@ end
     
     def save_definition(self):
         """Save the new CLEX definition."""
+        # Run a name check still waiting for typing to pause
+        if self._validate_timer.isActive():
+            self._validate_timer.stop()
+            self.validate_device_name()
+        
         # Validate form
         if not self.form_validator.is_form_valid():
             self.form_validator.show_errors()
@@ -249,61 +277,68 @@ end
         file_name = self.file_input.text().strip()
         
         try:
-            # Check again if device name exists (in case of race condition)
-            if self.db_manager:
-                exists = self.db_manager.device_name_exists(device_name, tech_id)
-            else:
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT id FROM devices WHERE name = ? AND technology_id = ?", 
-                    (device_name, tech_id)
-                )
-                exists = cursor.fetchone() is not None
-                conn.close()
-            
-            if exists:
-                QMessageBox.warning(
-                    self, "Duplicate Device",
-                    f"A device named '{device_name}' already exists in this technology."
-                )
-                return
-            
-            # Create the new device and CLEX definition
+            # Create the new device and CLEX definition; the unique index on
+            # (technology_id, name) rejects duplicates atomically
             if self.db_manager:
                 device_id = self.db_manager.create_new_device_with_clex(
                     device_name, tech_id, folder_path, file_name, definition_text
                 )
             else:
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                
-                # Create a new device
-                cursor.execute(
-                    "INSERT INTO devices (name, technology_id, has_clex_definition) VALUES (?, ?, 1)",
-                    (device_name, tech_id)
-                )
-                device_id = cursor.lastrowid
-                
-                # Add the CLEX definition
-                cursor.execute(
-                    "INSERT INTO clex_definitions (device_id, folder_path, file_name, definition_text) "
-                    "VALUES (?, ?, ?, ?)",
-                    (device_id, folder_path, file_name, definition_text)
-                )
-                
-                conn.commit()
-                conn.close()
+                # The shared connection autocommits, so both inserts run in
+                # an explicit transaction
+                conn = get_shared_connection(self.db_file)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = conn.cursor()
+                    
+                    # Check again if device name exists (in case of race condition)
+                    cursor.execute(
+                        "SELECT id FROM devices WHERE name = ? AND technology_id = ?", 
+                        (device_name, tech_id)
+                    )
+                    if cursor.fetchone() is not None:
+                        raise DuplicateDeviceError(
+                            f"A device named '{device_name}' already exists in this technology."
+                        )
+                    
+                    # Create a new device
+                    cursor.execute(
+                        "INSERT INTO devices (name, technology_id, has_clex_definition) VALUES (?, ?, 1)",
+                        (device_name, tech_id)
+                    )
+                    device_id = cursor.lastrowid
+                    
+                    # Add the CLEX definition
+                    cursor.execute(
+                        "INSERT INTO clex_definitions (device_id, folder_path, file_name, definition_text) "
+                        "VALUES (?, ?, ?, ?)",
+                        (device_id, folder_path, file_name, definition_text)
+                    )
+                except sqlite3.IntegrityError as e:
+                    conn.execute("ROLLBACK")
+                    if isinstance(e, DuplicateDeviceError) or not is_duplicate_device_error(e):
+                        raise
+                    # Rejected by the unique (technology_id, name) index, as
+                    # DatabaseManager.create_new_device_with_clex reports it
+                    raise DuplicateDeviceError(
+                        f"A device named '{device_name}' already exists in this technology."
+                    ) from e
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
             
             QMessageBox.information(
                 self, "Success", "New device and CLEX definition added successfully."
             )
             
             # Notify parent to refresh
-            if hasattr(self.parent, 'refresh_database'):
-                self.parent.refresh_database()
+            if self._refresh_database is not None:
+                self._refresh_database()
             
             self.accept()
             
+        except DuplicateDeviceError as e:
+            QMessageBox.warning(self, "Duplicate Device", str(e))
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to save CLEX definition: {e}")
\ No newline at end of file
@@ -1,12 +1,149 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, 
-                           QWidget, QTextEdit, QTableWidget, QTableWidgetItem,
+                           QWidget, QTextEdit, QTableView,
                            QPushButton, QHeaderView, QAbstractItemView)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QFont, QColor
 import sqlite3
 import re
 from typing import List, Dict, Tuple, Any, Optional
 
+from database_manager import get_shared_connection
+
+# Rows measured when fitting columns to their contents; the rest are not
+# visited, so a large limits table still resizes in constant time
+RESIZE_SAMPLE_ROWS = 200
+
+# Voltage and current limits in a CLEX definition, as (terminals, min, max)
+_VOLTAGE_LIMIT_RE = re.compile(r'expr=".*?V\(([^)]+)\).*?min=([^,\s]+).*?max=([^,\s]+)')
+_CURRENT_LIMIT_RE = re.compile(r'expr="I\(([^)]+)\)".*?min=([^,\s]+).*?max=([^,\s]+)')
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """
+    Order numbers numerically, before any text.
+    
+    Args:
+        value: Cell value
+        
+    Returns:
+        Key comparable across numbers and strings
+    """
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value))
+
+class StatsTableModel(QAbstractTableModel):
+    """
+    Read-only table model for a statistics tab.
+    
+    Keeps the rows as the tuples the dialog computed instead of one
+    QTableWidgetItem per cell, and sorts them by their raw values so
+    counts and percentages sort numerically.
+    """
+    
+    TITLE_BACKGROUND = QColor(230, 230, 230)
+    
+    # Created on first use because a QFont cannot be built before the
+    # QApplication exists
+    _bold_font = None
+    
+    def __init__(self, headers: List[str], column_formats: Optional[Dict[int, str]] = None,
+                 title: Optional[str] = None, parent=None):
+        """
+        Initialize an empty model.
+        
+        Args:
+            headers: Column headers
+            column_formats: Format specs applied to the values of some columns
+            title: Text of a shaded first row kept above the sorted rows,
+                shown only while there are rows
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._headers = headers
+        self._column_formats = column_formats or {}
+        self._title = title
+        self._rows: List[Tuple] = []
+        self._sort_order: Optional[Tuple[int, int]] = None
+    
+    def set_rows(self, rows: List[Tuple]):
+        """
+        Replace the model contents, keeping the current sort order.
+        
+        Args:
+            rows: One tuple of values per row
+        """
+        self.beginResetModel()
+        self._rows = rows
+        if self._sort_order is not None:
+            self._sort_rows(*self._sort_order)
+        self.endResetModel()
+    
+    def _title_rows(self) -> int:
+        """Return the number of title rows shown above the data."""
+        return 1 if self._title and self._rows else 0
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Return the number of rows."""
+        return 0 if parent.isValid() else len(self._rows) + self._title_rows()
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Return the data for a cell."""
+        if not index.isValid():
+            return None
+        row, column = index.row() - self._title_rows(), index.column()
+        
+        if row < 0:
+            if role == Qt.DisplayRole:
+                return self._title if column == 0 else ""
+            if role == Qt.BackgroundRole:
+                return self.TITLE_BACKGROUND
+            if role == Qt.FontRole:
+                if StatsTableModel._bold_font is None:
+                    StatsTableModel._bold_font = QFont()
+                    StatsTableModel._bold_font.setBold(True)
+                return StatsTableModel._bold_font
+            return None
+        
+        if role == Qt.DisplayRole:
+            value = self._rows[row][column]
+            spec = self._column_formats.get(column)
+            return format(value, spec) if spec else str(value)
+        return None
+    
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole):
+        """Return the column headers."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+    
+    def sort(self, column: int, order: int = Qt.AscendingOrder):
+        """
+        Sort the rows below the title by a column.
+        
+        Args:
+            column: Column to sort by
+            order: Qt.AscendingOrder or Qt.DescendingOrder
+        """
+        self._sort_order = (column, order)
+        self.layoutAboutToBeChanged.emit()
+        self._sort_rows(column, order)
+        self.layoutChanged.emit()
+    
+    def _sort_rows(self, column: int, order: int):
+        """
+        Sort the rows in place.
+        
+        Args:
+            column: Column to sort by
+            order: Qt.AscendingOrder or Qt.DescendingOrder
+        """
+        self._rows.sort(key=lambda row: _sort_key(row[column]),
+                        reverse=order == Qt.DescendingOrder)
+
 class StatsDialog(QDialog):
     """
     Dialog for displaying statistics about CLEX definitions.
@@ -86,9 +223,16 @@ class StatsDialog(QDialog):
         layout = QVBoxLayout()
         
         # Limits table
-        self.limits_table = QTableWidget()
+        self.limits_model = StatsTableModel(
+            ["Device", "Technology", "Terminals", "Min Value", "Max Value"],
+            title="Voltage Limits (V)", parent=self
+        )
+        self.limits_table = QTableView()
+        self.limits_table.setModel(self.limits_model)
         self.limits_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.limits_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.limits_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.limits_table.horizontalHeader().setResizeContentsPrecision(RESIZE_SAMPLE_ROWS)
         self.limits_table.setSortingEnabled(True)
         self.limits_table.setAlternatingRowColors(True)
         layout.addWidget(self.limits_table)
@@ -100,9 +244,16 @@ class StatsDialog(QDialog):
         layout = QVBoxLayout()
         
         # Technology table
-        self.tech_table = QTableWidget()
+        self.tech_model = StatsTableModel(
+            ["Technology", "Version", "Total Devices", "CLEX Devices", "CLEX Coverage (%)"],
+            column_formats={4: ".1f"}, parent=self
+        )
+        self.tech_table = QTableView()
+        self.tech_table.setModel(self.tech_model)
         self.tech_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tech_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tech_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.tech_table.horizontalHeader().setResizeContentsPrecision(RESIZE_SAMPLE_ROWS)
         self.tech_table.setSortingEnabled(True)
         self.tech_table.setAlternatingRowColors(True)
         layout.addWidget(self.tech_table)
@@ -112,8 +263,8 @@ class StatsDialog(QDialog):
     def refresh_stats(self):
         """Refresh all statistics from the database."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            # The shared connection keeps its page cache between refreshes
+            cursor = get_shared_connection(self.db_file).cursor()
             
             # Refresh overview tab
             self.refresh_overview_stats(cursor)
@@ -123,8 +274,6 @@ class StatsDialog(QDialog):
             
             # Refresh technology tab
             self.refresh_tech_stats(cursor)
-            
-            conn.close()
         
         except sqlite3.Error as e:
             from PyQt5.QtWidgets import QMessageBox
@@ -137,18 +286,16 @@ class StatsDialog(QDialog):
         Args:
             cursor: Database cursor
         """
-        # Get counts
-        cursor.execute("SELECT COUNT(*) FROM technologies")
-        tech_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM devices")
-        device_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM devices WHERE has_clex_definition = 1")
-        clex_device_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM clex_definitions")
-        clex_count = cursor.fetchone()[0]
+        # Get all counts in one statement; the devices scan counts both
+        # every device and the ones with a CLEX definition
+        cursor.execute(
+            "SELECT (SELECT COUNT(*) FROM technologies), "
+            "COUNT(*), "
+            "COALESCE(SUM(has_clex_definition = 1), 0), "
+            "(SELECT COUNT(*) FROM clex_definitions) "
+            "FROM devices"
+        )
+        tech_count, device_count, clex_device_count, clex_count = cursor.fetchone()
         
         # Calculate percentage of devices with CLEX definitions
         clex_percentage = 0
@@ -201,17 +348,21 @@ class StatsDialog(QDialog):
         voltage_limits = []
         current_limits = []
         
-        # Extract voltage and current limits from CLEX definitions
+        # Extract voltage and current limits from CLEX definitions; SQLite
+        # skips definitions neither pattern can match, so their text is
+        # never copied into Python
         cursor.execute(
             "SELECT d.name, t.name, c.definition_text "
             "FROM clex_definitions c "
             "JOIN devices d ON c.device_id = d.id "
-            "JOIN technologies t ON d.technology_id = t.id"
+            "JOIN technologies t ON d.technology_id = t.id "
+            "WHERE c.definition_text LIKE '%expr=\"%V(%' "
+            "OR c.definition_text LIKE '%expr=\"I(%'"
         )
         
         for device_name, tech_name, definition_text in cursor.fetchall():
             # Extract voltage limits
-            for match in re.finditer(r'expr=".*?V\(([^)]+)\).*?min=([^,\s]+).*?max=([^,\s]+)', definition_text):
+            for match in _VOLTAGE_LIMIT_RE.finditer(definition_text):
                 terminals, min_val, max_val = match.groups()
                 try:
                     min_val = float(min_val) if min_val.replace('.', '', 1).isdigit() else min_val
@@ -221,7 +372,7 @@ class StatsDialog(QDialog):
                 voltage_limits.append((device_name, tech_name, terminals, min_val, max_val))
             
             # Extract current limits
-            for match in re.finditer(r'expr="I\(([^)]+)\)".*?min=([^,\s]+).*?max=([^,\s]+)', definition_text):
+            for match in _CURRENT_LIMIT_RE.finditer(definition_text):
                 terminal, min_val, max_val = match.groups()
                 try:
                     min_val = float(min_val) if min_val.replace('.', '', 1).isdigit() else min_val
@@ -230,36 +381,8 @@ class StatsDialog(QDialog):
                     pass
                 current_limits.append((device_name, tech_name, terminal, min_val, max_val))
         
-        # Set up voltage limits table
-        self.limits_table.clear()
-        self.limits_table.setColumnCount(5)
-        self.limits_table.setHorizontalHeaderLabels(["Device", "Technology", "Terminals", "Min Value", "Max Value"])
-        
-        # Populate voltage limits
-        if voltage_limits:
-            self.limits_table.setRowCount(len(voltage_limits) + 1)
-            
-            # Add header row
-            header_item = QTableWidgetItem("Voltage Limits (V)")
-            header_item.setBackground(QColor(230, 230, 230))
-            header_font = QFont()
-            header_font.setBold(True)
-            header_item.setFont(header_font)
-            self.limits_table.setItem(0, 0, header_item)
-            
-            # Fill cells in header row
-            for i in range(1, 5):
-                item = QTableWidgetItem("")
-                item.setBackground(QColor(230, 230, 230))
-                self.limits_table.setItem(0, i, item)
-            
-            # Add voltage limit rows
-            for row, (device_name, tech_name, terminals, min_val, max_val) in enumerate(voltage_limits, 1):
-                self.limits_table.setItem(row, 0, QTableWidgetItem(device_name))
-                self.limits_table.setItem(row, 1, QTableWidgetItem(tech_name))
-                self.limits_table.setItem(row, 2, QTableWidgetItem(terminals))
-                self.limits_table.setItem(row, 3, QTableWidgetItem(str(min_val)))
-                self.limits_table.setItem(row, 4, QTableWidgetItem(str(max_val)))
+        # Show the voltage limits below their title row
+        self.limits_model.set_rows(voltage_limits)
         
         # Resize columns to content
         self.limits_table.resizeColumnsToContents()
@@ -275,38 +398,21 @@ class StatsDialog(QDialog):
         cursor.execute(
             "SELECT t.name, t.version, "
             "COUNT(d.id) as device_count, "
-            "SUM(CASE WHEN d.has_clex_definition = 1 THEN 1 ELSE 0 END) as clex_count "
+            "COALESCE(SUM(d.has_clex_definition = 1), 0) as clex_count "
             "FROM technologies t "
             "LEFT JOIN devices d ON t.id = d.technology_id "
             "GROUP BY t.id "
             "ORDER BY t.name"
         )
-        techs = cursor.fetchall()
-        
-        # Set up table
-        self.tech_table.clear()
-        self.tech_table.setColumnCount(5)
-        self.tech_table.setHorizontalHeaderLabels([
-            "Technology", "Version", "Total Devices", "CLEX Devices", "CLEX Coverage (%)"
-        ])
-        
-        # Populate table
-        self.tech_table.setRowCount(len(techs))
-        for row, (tech_name, tech_version, device_count, clex_count) in enumerate(techs):
+        
+        rows = []
+        for tech_name, tech_version, device_count, clex_count in cursor.fetchall():
             # Calculate coverage percentage
-            coverage = 0
+            coverage = 0.0
             if device_count > 0 and clex_count is not None:
                 coverage = (clex_count / device_count) * 100
-            
-            # Create table items
-            self.tech_table.setItem(row, 0, QTableWidgetItem(tech_name))
-            self.tech_table.setItem(row, 1, QTableWidgetItem(tech_version or ""))
-            self.tech_table.setItem(row, 2, QTableWidgetItem(str(device_count)))
-            self.tech_table.setItem(row, 3, QTableWidgetItem(str(clex_count or 0)))
-            
-            coverage_item = QTableWidgetItem(f"{coverage:.1f}")
-            coverage_item.setData(Qt.DisplayRole, coverage)  # For proper sorting
-            self.tech_table.setItem(row, 4, coverage_item)
+            rows.append((tech_name, tech_version or "", device_count, clex_count or 0, coverage))
+        self.tech_model.set_rows(rows)
         
         # Resize columns to content
         self.tech_table.resizeColumnsToContents()
\ No newline at end of file
@@ -17,6 +17,14 @@ class EmergencyBrowser(QMainWindow):
         self.current_tech_id = None
         self.current_device_id = None
         
+        # One connection for the window's lifetime, so SQLite keeps its page
+        # cache between clicks instead of reopening the file each time
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        
         # Set up UI
         self.setWindowTitle('Emergency CLEX Browser')
         self.resize(1000, 700)
@@ -86,17 +94,12 @@ class EmergencyBrowser(QMainWindow):
         print("Loading technologies directly...")
         
         try:
-            # Connect to database
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            cursor = self.conn.cursor()
             
             # Get technologies
             cursor.execute("SELECT id, name, version FROM technologies ORDER BY name")
             self.technologies = cursor.fetchall()
             
-            # Close connection
-            conn.close()
-            
             # Update UI
             self.tech_list.clear()
             for tech_id, tech_name, tech_version in self.technologies:
@@ -125,9 +128,7 @@ class EmergencyBrowser(QMainWindow):
         self.status_bar.showMessage(f"Loading devices for {tech_name}...")
         
         try:
-            # Connect to database
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            cursor = self.conn.cursor()
             
             # Get devices
             cursor.execute(
@@ -136,9 +137,6 @@ class EmergencyBrowser(QMainWindow):
             )
             self.devices = cursor.fetchall()
             
-            # Close connection
-            conn.close()
-            
             # Update UI
             self.device_list.clear()
             for device_id, device_name, has_clex in self.devices:
@@ -178,9 +176,7 @@ class EmergencyBrowser(QMainWindow):
             self.status_bar.showMessage(f"Loading CLEX definition for {device_name}...")
             
             try:
-                # Connect to database
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
+                cursor = self.conn.cursor()
                 
                 # Get CLEX definition
                 cursor.execute(
@@ -189,9 +185,6 @@ class EmergencyBrowser(QMainWindow):
                 )
                 result = cursor.fetchone()
                 
-                # Close connection
-                conn.close()
-                
                 if result:
                     folder_path, file_name, definition_text = result
                     
@@ -215,6 +208,11 @@ class EmergencyBrowser(QMainWindow):
             self.clex_text.clear()
             self.status_bar.showMessage(f"Device {device_name} has no CLEX definition")
             print(f"Device {device_name} has no CLEX definition")
+    
+    def closeEvent(self, event):
+        """Close the database connection along with the window."""
+        self.conn.close()
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
@@ -6,6 +6,8 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QTextEdit, QSplitter, QMessageBox, QStatusBar)
 from PyQt5.QtCore import Qt, QSettings
 
+from database_manager import HEADER_LINE_RE
+
 class MinimalCLEXBrowser(QMainWindow):
     """Minimal CLEX Browser with essential functionality only."""
     
@@ -210,11 +212,10 @@ class MinimalCLEXBrowser(QMainWindow):
                 
                 # Format text
                 header_text = f"Device: {device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
-                filtered_lines = [
-                    line for line in definition_text.split('\n') 
-                    if not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
-                filtered_definition = '\n'.join(filtered_lines)
+                filtered_definition = '\n'.join(
+                    line for line in definition_text.splitlines()
+                    if not HEADER_LINE_RE.match(line)
+                )
                 
                 # Update UI
                 self.clex_text.setPlainText(header_text + filtered_definition)
@@ -1,6 +1,14 @@
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont, QColor
 import re
-from typing import Optional
+from typing import Dict, Optional
+
+# Patterns compiled once; highlightBlock only ever looks at the block's own text
+_INLINE_RE = re.compile(r'(inline\s+subckt\s+\w+\s*)(\([^)]*\))(.*)')
+_KEYWORD_RE = re.compile(
+    r'\b(?:inline|subckt|assert|expr|min|max|level|duration|sub|anal_types)\b'
+)
+_ASSERTION_RE = re.compile(r'\b(?:clexvw|clexcw|clex_)\w*')
+_MESSAGE_RE = re.compile(r'message="([^"]*)"')
 
 class SyntaxHighlighter(QSyntaxHighlighter):
     """
@@ -11,62 +19,107 @@ class SyntaxHighlighter(QSyntaxHighlighter):
     visually distinct with different colors and styles.
     """
     
-    def __init__(self, parent=None, dark_mode=False):
+    # Text formats shared by every instance, keyed by dark_mode; built on
+    # first use by _format_table
+    _FORMATS: Dict[bool, Dict[str, QTextCharFormat]] = {}
+    
+    @classmethod
+    def _format_table(cls, dark_mode: bool) -> Dict[str, QTextCharFormat]:
         """
-        Initialize the syntax highlighter.
+        Get the text formats for a color scheme, creating them on first call.
         
         Args:
-            parent: Parent document (typically a QTextDocument)
             dark_mode: Whether to use dark mode colors
+            
+        Returns:
+            Dictionary mapping format attribute name to its QTextCharFormat
         """
-        super().__init__(parent)
-        self.dark_mode = dark_mode
-        self.create_formats()
+        dark_mode = bool(dark_mode)
+        formats = cls._FORMATS.get(dark_mode)
+        if formats is None:
+            formats = cls._FORMATS[dark_mode] = cls._build_formats(dark_mode)
+        return formats
+    
+    @staticmethod
+    def _build_formats(dark_mode: bool) -> Dict[str, QTextCharFormat]:
+        """
+        Create text formats for different syntax elements.
         
-    def create_formats(self):
-        """Create text formats for different syntax elements."""
+        Args:
+            dark_mode: Whether to use dark mode colors
+            
+        Returns:
+            Dictionary mapping format attribute name to its QTextCharFormat
+        """
         # Keyword format (for CLEX keywords like 'inline', 'subckt', etc.)
-        self.keyword_format = QTextCharFormat()
-        self.keyword_format.setFontWeight(QFont.Bold)
-        self.keyword_format.setForeground(
-            QColor("#0066CC") if not self.dark_mode else QColor("#56AAFF")
+        keyword_format = QTextCharFormat()
+        keyword_format.setFontWeight(QFont.Bold)
+        keyword_format.setForeground(
+            QColor("#0066CC") if not dark_mode else QColor("#56AAFF")
         )
         
         # Assertion format (for assertions like 'clexvw', 'clexcw', etc.)
-        self.assertion_format = QTextCharFormat()
-        self.assertion_format.setFontWeight(QFont.Bold)
-        self.assertion_format.setForeground(
-            QColor("#CC0000") if not self.dark_mode else QColor("#FF5555")
+        assertion_format = QTextCharFormat()
+        assertion_format.setFontWeight(QFont.Bold)
+        assertion_format.setForeground(
+            QColor("#CC0000") if not dark_mode else QColor("#FF5555")
         )
         
         # Device format (for device headers)
-        self.device_format = QTextCharFormat()
-        self.device_format.setFontWeight(QFont.Bold)
+        device_format = QTextCharFormat()
+        device_format.setFontWeight(QFont.Bold)
         
         # File format (for file and folder paths)
-        self.file_format = QTextCharFormat()
-        self.file_format.setForeground(
-            QColor("#0066CC") if not self.dark_mode else QColor("#56AAFF")
+        file_format = QTextCharFormat()
+        file_format.setForeground(
+            QColor("#0066CC") if not dark_mode else QColor("#56AAFF")
         )
         
         # Terminals format (for terminal connections)
-        self.terminals_format = QTextCharFormat()
-        self.terminals_format.setForeground(
-            QColor("#008800") if not self.dark_mode else QColor("#55FF55")
+        terminals_format = QTextCharFormat()
+        terminals_format.setForeground(
+            QColor("#008800") if not dark_mode else QColor("#55FF55")
         )
         
         # Message format (for message strings)
-        self.message_format = QTextCharFormat()
-        self.message_format.setForeground(
-            QColor("#8800AA") if not self.dark_mode else QColor("#CC55FF")
+        message_format = QTextCharFormat()
+        message_format.setForeground(
+            QColor("#8800AA") if not dark_mode else QColor("#CC55FF")
         )
         
         # Comment format (for comment lines)
-        self.comment_format = QTextCharFormat()
-        self.comment_format.setForeground(
-            QColor("#808080") if not self.dark_mode else QColor("#AAAAAA")
+        comment_format = QTextCharFormat()
+        comment_format.setForeground(
+            QColor("#808080") if not dark_mode else QColor("#AAAAAA")
         )
-        self.comment_format.setFontItalic(True)
+        comment_format.setFontItalic(True)
+        
+        return {
+            'keyword_format': keyword_format,
+            'assertion_format': assertion_format,
+            'device_format': device_format,
+            'file_format': file_format,
+            'terminals_format': terminals_format,
+            'message_format': message_format,
+            'comment_format': comment_format,
+        }
+    
+    def __init__(self, parent=None, dark_mode=False):
+        """
+        Initialize the syntax highlighter.
+        
+        Args:
+            parent: Parent document (typically a QTextDocument)
+            dark_mode: Whether to use dark mode colors
+        """
+        super().__init__(parent)
+        self.dark_mode = dark_mode
+        self.create_formats()
+        
+    def create_formats(self):
+        """Use the shared text formats for the current color scheme."""
+        for name, text_format in self._format_table(self.dark_mode).items():
+            setattr(self, name, text_format)
     
     def set_dark_mode(self, dark_mode: bool):
         """
@@ -97,7 +150,7 @@ class SyntaxHighlighter(QSyntaxHighlighter):
             return
         
         # Handle inline subckt with terminals
-        inline_match = re.match(r'(inline\s+subckt\s+\w+\s*)(\([^)]*\))(.*)', text)
+        inline_match = _INLINE_RE.match(text)
         if inline_match:
             self.setFormat(0, len(inline_match.group(1)), self.keyword_format)
             start_terminals = len(inline_match.group(1))
@@ -106,22 +159,15 @@ class SyntaxHighlighter(QSyntaxHighlighter):
             return
         
         # Highlight keywords
-        keywords = ["inline", "subckt", "assert", "expr", "min", "max", "level", 
-                   "duration", "sub", "anal_types"]
-        for keyword in keywords:
-            pattern = r'\b' + keyword + r'\b'
-            for match in re.finditer(pattern, text):
-                self.setFormat(match.start(), match.end() - match.start(), self.keyword_format)
+        for match in _KEYWORD_RE.finditer(text):
+            self.setFormat(match.start(), match.end() - match.start(), self.keyword_format)
         
         # Highlight assertions
-        assertions = ["clexvw", "clexcw", "clex_"]
-        for assertion in assertions:
-            pattern = r'\b' + assertion + r'\w*'
-            for match in re.finditer(pattern, text):
-                self.setFormat(match.start(), match.end() - match.start(), self.assertion_format)
+        for match in _ASSERTION_RE.finditer(text):
+            self.setFormat(match.start(), match.end() - match.start(), self.assertion_format)
         
         # Highlight message strings
-        message_match = re.search(r'message="([^"]*)"', text)
+        message_match = _MESSAGE_RE.search(text)
         if message_match:
             start_pos = message_match.start(1)
             length = len(message_match.group(1))
@@ -1,2 +1,3 @@
 # workers/__init__.py
-from .database_worker import DatabaseWorker, CreateDatabaseWorker, LoadTechnologiesWorker, LoadDevicesWorker, LoadClexDefinitionWorker
\ No newline at end of file
+from .database_worker import DatabaseWorker, CreateDatabaseWorker, LoadTechnologiesWorker, LoadDevicesWorker, LoadClexDefinitionWorker
+from .db_task import DbTask, DbStreamTask, DbTaskSignals
@@ -4,6 +4,8 @@ import time
 import os
 from typing import List, Tuple, Dict, Any, Optional, Union
 
+from database_manager import HEADER_LINE_RE
+
 class DatabaseWorker(QThread):
     """
     Base worker class for handling database operations asynchronously.
@@ -339,12 +341,10 @@ class LoadClexDefinitionWorker(DatabaseWorker):
                 
                 # Process the definition text
                 header_text = f"Device: {self.device_name}\nFolder: {folder_path}\nFile: {file_name}\n\n"
-                definition_lines = definition_text.split('\n')
-                filtered_lines = [
-                    line for line in definition_lines 
-                    if not line.strip().startswith(("Folder Path:", "File Name:"))
-                ]
-                filtered_definition = '\n'.join(filtered_lines)
+                filtered_definition = '\n'.join(
+                    line for line in definition_text.splitlines()
+                    if not HEADER_LINE_RE.match(line)
+                )
                 
                 # Prepare the result
                 clex_data = {
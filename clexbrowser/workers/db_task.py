@@ -0,0 +1,66 @@
+# workers/db_task.py
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+class DbTaskSignals(QObject):
+    """
+    Signals for a DbTask.
+
+    QRunnable is not a QObject, so the signals live on this helper object.
+    It is created on the GUI thread, which makes connected slots run there.
+    """
+
+    finished = pyqtSignal(object)  # Return operation result
+    chunk = pyqtSignal(object)  # Partial result of a streaming task
+    error = pyqtSignal(str)  # Report error message
+
+
+class DbTask(QRunnable):
+    """
+    Runnable that executes a database read on a QThreadPool thread.
+
+    The callable should go through DatabaseManager, whose shared connection
+    is guarded by a lock so only one pool thread touches SQLite at a time,
+    or read through its own open_task_connection(). The unlocked
+    get_shared_connection() belongs to the GUI thread.
+    """
+
+    def __init__(self, fn):
+        """
+        Initialize the task.
+
+        Args:
+            fn: Callable taking no arguments; its return value is emitted
+                through signals.finished
+        """
+        super().__init__()
+        self.fn = fn
+        self.signals = DbTaskSignals()
+
+    def run(self):
+        """Execute the callable and report the result."""
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class DbStreamTask(DbTask):
+    """
+    DbTask whose callable returns an iterable of result chunks.
+
+    Each chunk is emitted through signals.chunk as soon as it is produced,
+    so the GUI can show early rows while the query is still running;
+    signals.finished is emitted with None once the iterable is exhausted.
+    """
+
+    def run(self):
+        """Iterate the callable's result and report each chunk."""
+        try:
+            for chunk in self.fn():
+                self.signals.chunk.emit(chunk)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(None)